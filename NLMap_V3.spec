@@ -36,7 +36,12 @@ a = Analysis(
         *country_data,
     ],
     hiddenimports=[
+        # Imported lazily through lazy_import(), which the analysis cannot see
+        'numpy',
+        'pandas',
+        'asyncio',
         'fuzzywuzzy',
+        'fuzzywuzzy.fuzz',
         'Levenshtein',
         'openpyxl',
         'yaml',
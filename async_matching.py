@@ -0,0 +1,162 @@
+"""
+Async Matching for NL Taxonomy Mapper V3
+Match keyword lists from asyncio code without blocking the event loop
+"""
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, Iterable, List, Optional, Tuple, Union
+
+from lazy_import import lazy_import
+from parallel_matching import init_worker, match_shard, merge_shard, shard_task
+
+# Only needed once match_many() runs; importing asyncio up front slows CLI startup
+asyncio = lazy_import('asyncio')
+
+
+# Default number of records per executor task
+DEFAULT_BATCH_SIZE = 50
+
+# Default number of batches submitted ahead of the consumer
+DEFAULT_MAX_PENDING = 4
+
+
+def record_fields(record) -> Tuple[str, List[str]]:
+    """
+    Get (url, keywords) from a record.
+
+    Args:
+        record: (url, keywords) pair or dict with 'url' and 'keywords'
+
+    Returns:
+        (url, keywords)
+    """
+    if isinstance(record, dict):
+        url, keywords = record.get('url', ''), record.get('keywords') or []
+    else:
+        url, keywords = record
+    return url, [str(kw).strip() for kw in keywords if kw is not None]
+
+
+def create_process_executor(matcher, workers: int) -> ProcessPoolExecutor:
+    """
+    Start a process pool executor whose workers hold a copy of the matcher.
+
+    Args:
+        matcher: TaxonomyMatcher with its lookup built
+        workers: Number of worker processes
+
+    Returns:
+        ProcessPoolExecutor usable with match_many()
+    """
+    return ProcessPoolExecutor(workers, initializer=init_worker,
+                               initargs=({matcher.country_code: matcher},))
+
+
+def _match_batch(matcher, batch: List[Tuple[str, List[str]]]) -> List[List[tuple]]:
+    """Match a batch of records in an executor thread (one batch at a time per matcher)."""
+    with matcher.lock:
+        # Score the whole batch's keyword variations at once, then match records
+        matcher.trim_scores()
+        matcher.score_keywords(kw for _, keywords in batch for kw in keywords)
+        return [matcher.match_keywords(url, keywords) for url, keywords in batch]
+
+
+def _emit_batch(matcher, batch: List[Tuple[str, List[str]]],
+                url_matches: List[List[int]]) -> List[List[tuple]]:
+    """Turn a worker's entry indices into output rows in the event loop thread."""
+    results = []
+    for (url, _), matches in zip(batch, url_matches):
+        rows = []
+        matcher.emit_url_rows(url, matches, set(), rows)
+        results.append(rows)
+    return results
+
+
+async def _iterate(records) -> AsyncIterator:
+    """Iterate over a sync or async iterable of records."""
+    if hasattr(records, '__aiter__'):
+        async for record in records:
+            yield record
+    else:
+        for record in records:
+            yield record
+
+
+async def match_many(matcher, records: Union[Iterable, AsyncIterator],
+                     executor: Optional[Executor] = None,
+                     batch_size: int = DEFAULT_BATCH_SIZE,
+                     max_pending: int = DEFAULT_MAX_PENDING) -> AsyncIterator[List[tuple]]:
+    """
+    Match records in an executor, yielding each record's rows in input order.
+
+    Records are grouped into batches and submitted to the executor. At most
+    max_pending batches are in flight; when the consumer falls behind, no
+    further records are read from the source.
+
+    Args:
+        matcher: TaxonomyMatcher with its lookup built
+        records: Iterable or async iterable of (url, keywords) pairs or dicts
+        executor: Thread executor, or a process executor from create_process_executor()
+                  (default: a single worker thread owned by this call)
+        batch_size: Records per executor task
+        max_pending: Batches submitted ahead of the consumer
+
+    Yields:
+        Output rows (URL, Product, Domain, Segment, Topic) of every record
+    """
+    loop = asyncio.get_running_loop()
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(1, thread_name_prefix='taxonomy-matcher')
+    in_processes = isinstance(executor, ProcessPoolExecutor)
+
+    pending = asyncio.Queue(maxsize=max(1, max_pending))
+
+    def submit(batch):
+        if in_processes:
+            with matcher.lock:
+                task = shard_task(matcher.country_code, matcher,
+                                  [keywords for _, keywords in batch])
+            return batch, loop.run_in_executor(executor, match_shard, task)
+        return batch, loop.run_in_executor(executor, _match_batch, matcher, batch)
+
+    async def produce():
+        batch = []
+        cancelled = False
+        try:
+            async for record in _iterate(records):
+                batch.append(record_fields(record))
+                if len(batch) >= batch_size:
+                    await pending.put(submit(batch))
+                    batch = []
+            if batch:
+                await pending.put(submit(batch))
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            # End the stream for the consumer; a reading error is raised by `await producer`
+            if not cancelled:
+                await pending.put(None)
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item = await pending.get()
+            if item is None:
+                break
+            batch, future = item
+            result = await future
+            if in_processes:
+                url_matches, new_rows, counters = result
+                with matcher.lock:
+                    merge_shard(matcher, new_rows, counters)
+                    result = _emit_batch(matcher, batch, url_matches)
+            for rows in result:
+                yield rows
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+        if own_executor:
+            executor.shutdown(wait=False)
@@ -0,0 +1,545 @@
+"""
+Benchmark Suite for NL Taxonomy Mapper V3
+Generates synthetic semantic carriers, taxonomies and synonyms, times each
+TaxonomyMatcher stage at several scales and writes a JSON report
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from output_sink import open_sink
+from run_stats import peak_memory_mb
+from scoring import NGramIndex, cdist
+from taxonomy_matcher import TaxonomyMatcher
+
+
+# Syllable inventories that give generated words a language-like shape
+LANGUAGES = {
+    'nl': {
+        'onsets': ['b', 'd', 'f', 'g', 'h', 'k', 'l', 'm', 'n', 'p', 'r', 's', 't', 'v', 'w',
+                   'z', 'sch', 'st', 'gr', 'kr', 'br', 'bl', 'vr'],
+        'vowels': ['a', 'e', 'i', 'o', 'u', 'aa', 'ee', 'oo', 'ij', 'ui', 'oe', 'ei'],
+        'codas': ['', '', 'n', 'r', 'k', 'ng', 'st', 'l', 'ld', 'cht'],
+        'suffixes': ['en', 'ing', 'heid', 'ering', 'tie', 's']
+    },
+    'se': {
+        'onsets': ['b', 'd', 'f', 'g', 'h', 'k', 'l', 'm', 'n', 'p', 'r', 's', 't', 'v',
+                   'sk', 'st', 'sv', 'fr', 'kr', 'tj', 'sj'],
+        'vowels': ['a', 'e', 'i', 'o', 'u', 'y', 'å', 'ä', 'ö'],
+        'codas': ['', '', 'n', 'r', 'k', 'ng', 'st', 'll', 'tt', 'nd'],
+        'suffixes': ['ar', 'en', 'ning', 'else', 'het', 'or']
+    },
+    'en': {
+        'onsets': ['b', 'c', 'd', 'f', 'g', 'h', 'l', 'm', 'n', 'p', 'r', 's', 't', 'w',
+                   'st', 'tr', 'pr', 'cl', 'sh', 'ch', 'th'],
+        'vowels': ['a', 'e', 'i', 'o', 'u', 'ea', 'ai', 'ou', 'ee'],
+        'codas': ['', '', 'n', 'r', 't', 'ng', 'st', 'll', 'nt', 'ck'],
+        'suffixes': ['s', 'ing', 'ment', 'tion', 'er', 'ed']
+    }
+}
+
+STAGES = ['load', 'lookup', 'matching', 'consolidation', 'save']
+
+# Wall-clock budget (seconds) for CLI commands that load no data
+STARTUP_BUDGET = 1.0
+
+# taxonomy_matcher.py invocations timed by --startup
+STARTUP_COMMANDS = {
+    'help': ['--help'],
+    'validate_config': ['--validate-config'],
+    'dry_run': ['--dry-run', '-t', '80']
+}
+
+# Thresholds at which n-gram pruning is checked against scoring every pair
+PRUNING_THRESHOLDS = [50, 70, 80, 90, 95]
+
+
+def generate_vocabulary(rng: random.Random, size: int, language: str = 'nl') -> List[str]:
+    """
+    Generate unique pseudo-words for a language.
+
+    Args:
+        rng: Random generator
+        size: Number of words
+        language: Key of LANGUAGES
+
+    Returns:
+        List of words
+    """
+    inventory = LANGUAGES[language]
+    words = set()
+    while len(words) < size:
+        syllables = rng.randint(2, 4)
+        word = ''.join(
+            rng.choice(inventory['onsets']) + rng.choice(inventory['vowels']) +
+            rng.choice(inventory['codas'])
+            for _ in range(syllables)
+        )
+        words.add(word)
+    return sorted(words)
+
+
+def _phrase(rng: random.Random, vocabulary: List[str], max_words: int) -> str:
+    """Join 1..max_words random vocabulary words."""
+    return ' '.join(rng.choice(vocabulary) for _ in range(rng.randint(1, max_words)))
+
+
+def generate_taxonomy(rng: random.Random, vocabulary: List[str], rows: int,
+                      topic_columns: int = 7) -> pd.DataFrame:
+    """
+    Generate a taxonomy shaped like NL_Taxonomy_V2_TEMPLATE.xlsx.
+
+    Args:
+        rng: Random generator
+        vocabulary: Words to build names from
+        rows: Number of segment rows
+        topic_columns: Number of Topic N columns
+
+    Returns:
+        DataFrame with Product, Productfamily, Domain, Segment, Topic 1..N
+    """
+    domains = [_phrase(rng, vocabulary, 1).capitalize() for _ in range(max(1, rows // 5))]
+    data = {'Product': [None] * rows, 'Productfamily': [None] * rows, 'Domain': [], 'Segment': []}
+    topics = [[] for _ in range(topic_columns)]
+
+    for _ in range(rows):
+        data['Domain'].append(rng.choice(domains))
+        data['Segment'].append(_phrase(rng, vocabulary, 2).capitalize())
+        filled = rng.randint(1, topic_columns)
+        for col in range(topic_columns):
+            topics[col].append(_phrase(rng, vocabulary, 3).capitalize() if col < filled else None)
+
+    for col in range(topic_columns):
+        data[f'Topic {col + 1}'] = topics[col]
+    return pd.DataFrame(data)
+
+
+def generate_semantic_carriers(rng: random.Random, vocabulary: List[str], urls: int,
+                               keywords_per_row: int = 6) -> pd.DataFrame:
+    """
+    Generate a semantic carriers sheet shaped like semantic_carriers_list_TEMPLATE.xlsx.
+
+    Keywords are drawn with a skewed distribution so common keywords repeat
+    across URLs, as they do in real crawl exports.
+
+    Args:
+        rng: Random generator
+        vocabulary: Words to build keywords from
+        urls: Number of URL rows
+        keywords_per_row: Filled Keyword N columns per row (max 10)
+
+    Returns:
+        DataFrame with URL metadata and Keyword 1..10 columns
+    """
+    keywords_per_row = min(keywords_per_row, 10)
+    keyword_pool = [_phrase(rng, vocabulary, 3) for _ in range(max(50, urls // 2))]
+    weights = [1 / (rank + 1) for rank in range(len(keyword_pool))]
+
+    data = {
+        'URL': [f'https://example.com/help/{i}' for i in range(urls)],
+        'Title': [_phrase(rng, vocabulary, 4).capitalize() for _ in range(urls)],
+        'Meta Description': [_phrase(rng, vocabulary, 8) for _ in range(urls)],
+        'Word Count': [rng.randint(150, 1500) for _ in range(urls)],
+        'Keywords Extracted': [keywords_per_row] * urls,
+        'Keywords Limit': [keywords_per_row] * urls,
+        'Headings Count': [rng.randint(2, 15) for _ in range(urls)]
+    }
+    for col in range(1, 11):
+        if col <= keywords_per_row:
+            data[f'Keyword {col}'] = rng.choices(keyword_pool, weights=weights, k=urls)
+        else:
+            data[f'Keyword {col}'] = [None] * urls
+    return pd.DataFrame(data)
+
+
+def generate_synonyms(rng: random.Random, vocabulary: List[str], size: int,
+                      language: str = 'nl') -> Dict[str, List[str]]:
+    """
+    Generate a synonym dictionary in the synonyms.json format.
+
+    Args:
+        rng: Random generator
+        vocabulary: Words to use as keys and synonyms
+        size: Number of synonym keys
+        language: Key of LANGUAGES (for inflection suffixes)
+
+    Returns:
+        Dict of key -> list of synonyms
+    """
+    suffixes = LANGUAGES[language]['suffixes']
+    keys = rng.sample(vocabulary, min(size, len(vocabulary)))
+    return {
+        key: [key + rng.choice(suffixes)] + rng.sample(vocabulary, rng.randint(0, 3))
+        for key in keys
+    }
+
+
+def time_stage(timings: Dict[str, float], stage: str, func, *args):
+    """Run func(*args), record its wall time under stage and return its result."""
+    start = time.perf_counter()
+    result = func(*args)
+    timings[stage] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def traced_peak_mb(func, *args) -> float:
+    """Run func(*args) under tracemalloc and return the peak traced heap in MB."""
+    tracemalloc.start()
+    try:
+        func(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 2)
+
+
+def measure_matching_memory(matcher: TaxonomyMatcher, workdir: str) -> Dict[str, float]:
+    """
+    Measure heap use of streamed matching and of its deduplication state.
+
+    Matching is rerun with rows streamed to CSV so the result list does not
+    dominate. The written rows are then replayed through the whole-run set of
+    (URL, Product, Domain, Segment, Topic) tuples deduplication used to keep,
+    and through the current per-URL set of integer-coded combinations.
+
+    Args:
+        matcher: Matcher that already ran once (scores are warm)
+        workdir: Directory for the streamed output
+
+    Returns:
+        Dict with matching_peak_mb, legacy_dedup_mb and per_url_dedup_mb
+    """
+    output_file = os.path.join(workdir, 'memory_output.csv')
+
+    def stream_matching():
+        with open_sink(output_file) as sink:
+            matcher.process_matching(sink)
+
+    matching_peak = traced_peak_mb(stream_matching)
+    rows = [tuple(row) for row in pd.read_csv(output_file, dtype=str, keep_default_na=False)
+            .itertuples(index=False)]
+
+    def legacy_dedup():
+        seen = set()
+        for row in rows:
+            seen.add(row)
+
+    codes = matcher.taxonomy_lookup.code_table()
+
+    def per_url_dedup():
+        current_url, seen = None, set()
+        for url, product, domain, segment, topic in rows:
+            if url != current_url:
+                current_url, seen = url, set()
+            if domain != 'UNMAPPED':
+                seen.add(codes[(product, domain, segment, topic)])
+
+    return {
+        'matching_peak_mb': matching_peak,
+        'legacy_dedup_mb': traced_peak_mb(legacy_dedup),
+        'per_url_dedup_mb': traced_peak_mb(per_url_dedup)
+    }
+
+
+def check_in_memory(taxonomy_df: pd.DataFrame, semantic_df: pd.DataFrame,
+                    synonyms: Dict, args, expected: pd.DataFrame) -> bool:
+    """
+    Match the generated data through the in-memory API and compare with the file run.
+
+    The taxonomy is passed as row dicts whose Product and Productfamily are
+    None, as in the template, so the object columns built from them go
+    through the same lookup code as a workbook read from disk.
+
+    Args:
+        taxonomy_df: Generated taxonomy
+        semantic_df: Generated semantic carriers
+        synonyms: Generated synonyms
+        args: Parsed command line arguments
+        expected: Results of the file-based run
+
+    Returns:
+        True if run_in_memory() returned the same rows
+    """
+    matcher = TaxonomyMatcher(
+        country_code=args.country,
+        similarity_threshold=args.threshold,
+        consolidate_topics=False,
+        use_score_cache=False
+    )
+    matcher.set_synonyms(synonyms)
+    matcher.set_taxonomy_data(
+        taxonomy_df.astype(object).where(taxonomy_df.notna(), None).to_dict('records')
+    )
+    matcher.set_semantic_data(semantic_df.copy())
+    results_df = matcher.run_in_memory()
+    return results_df.reset_index(drop=True).equals(expected.reset_index(drop=True))
+
+
+def check_pruning(rng: random.Random, vocabulary: List[str],
+                  queries: int = 300, choices: int = 150) -> List[int]:
+    """
+    Check that n-gram index pruning never drops a pair that reaches the threshold.
+
+    Choices are generated phrases; queries mix unrelated phrases, edited
+    copies of choices (near the thresholds) and very short strings. At
+    every PRUNING_THRESHOLDS value, cdist() with an NGramIndex must equal
+    cdist() over every pair with the scores below the threshold zeroed.
+
+    Args:
+        rng: Random generator
+        vocabulary: Words to build phrases from
+        queries: Number of query strings
+        choices: Number of choice strings
+
+    Returns:
+        Thresholds at which the pruned scores differ (empty when lossless)
+    """
+    choice_list = list(dict.fromkeys(_phrase(rng, vocabulary, 3) for _ in range(choices)))
+
+    def edited(text: str) -> str:
+        chars = list(text)
+        for _ in range(rng.randint(0, 3)):
+            position = rng.randrange(len(chars) + 1)
+            operation = rng.choice(['insert', 'delete', 'replace'])
+            if operation == 'insert' or not chars:
+                chars.insert(position, rng.choice('abcdefghijklmnopqrstuvwxyz '))
+            elif position < len(chars):
+                if operation == 'delete':
+                    del chars[position]
+                else:
+                    chars[position] = rng.choice('abcdefghijklmnopqrstuvwxyz ')
+        return ''.join(chars)
+
+    query_list = []
+    for i in range(queries):
+        kind = i % 4
+        if kind == 0:
+            query_list.append(_phrase(rng, vocabulary, 2))
+        elif kind == 1:
+            query_list.append(edited(rng.choice(choice_list)))
+        elif kind == 2:
+            choice = rng.choice(choice_list)
+            start = rng.randrange(len(choice))
+            query_list.append(edited(choice[start:start + rng.randint(3, 12)]))
+        else:
+            query_list.append(rng.choice(vocabulary)[:rng.randint(0, 3)])
+    query_list = list(dict.fromkeys(query_list))
+
+    full = cdist(query_list, choice_list)
+    index = NGramIndex(choice_list)
+    return [threshold for threshold in PRUNING_THRESHOLDS
+            if not np.array_equal(cdist(query_list, choice_list, score_cutoff=threshold, index=index),
+                                  np.where(full >= threshold, full, 0))]
+
+
+def measure_startup(repeats: int, country: str = None) -> Dict[str, float]:
+    """
+    Time STARTUP_COMMANDS in fresh interpreters.
+
+    Args:
+        repeats: Runs per command (the median is reported)
+        country: Country for the dry run (default: config default)
+
+    Returns:
+        Dict of command name -> median wall time in seconds
+    """
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'taxonomy_matcher.py')
+    timings = {}
+    for name, arguments in STARTUP_COMMANDS.items():
+        if name == 'dry_run' and country:
+            arguments = arguments + ['-c', country]
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            # Exit status is not checked: validation fails for countries without data
+            subprocess.run([sys.executable, script] + arguments,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            times.append(time.perf_counter() - start)
+        timings[name] = statistics.median(times)
+    return timings
+
+
+def run_scale(urls: int, args, workdir: str, in_memory_check: bool = False) -> Dict:
+    """
+    Generate inputs for one scale and time every matcher stage.
+
+    Args:
+        urls: Number of URL rows
+        args: Parsed command line arguments
+        workdir: Directory for generated inputs and outputs
+        in_memory_check: Also verify run_in_memory() against the file run
+
+    Returns:
+        Result dict for the report
+    """
+    rng = random.Random(args.seed)
+    vocabulary = generate_vocabulary(rng, args.vocabulary, args.language)
+    taxonomy_df = generate_taxonomy(rng, vocabulary, args.taxonomy_rows, args.topic_columns)
+    semantic_df = generate_semantic_carriers(rng, vocabulary, urls, args.keywords_per_row)
+    synonyms = generate_synonyms(rng, vocabulary, args.synonyms, args.language)
+
+    semantic_file = os.path.join(workdir, f'semantic_{urls}.xlsx')
+    taxonomy_file = os.path.join(workdir, f'taxonomy_{urls}.xlsx')
+    semantic_df.to_excel(semantic_file, index=False)
+    taxonomy_df.to_excel(taxonomy_file, index=False)
+
+    matcher = TaxonomyMatcher(
+        country_code=args.country,
+        semantic_file=semantic_file,
+        taxonomy_file=taxonomy_file,
+        output_file=os.path.join(workdir, f'output_{urls}.xlsx'),
+        similarity_threshold=args.threshold,
+        consolidate_topics=False,
+        use_score_cache=False,
+        workers=args.workers,
+        chunk_size=args.chunk_size
+    )
+    matcher.set_synonyms(synonyms)
+
+    timings = {}
+    log = io.StringIO()
+    with contextlib.redirect_stdout(sys.stdout if args.verbose else log):
+        time_stage(timings, 'load', matcher.load_data)
+        time_stage(timings, 'lookup', matcher.build_taxonomy_lookup)
+        results_df = time_stage(timings, 'matching', matcher.process_matching)
+        consolidated_df = time_stage(timings, 'consolidation',
+                                     matcher.consolidate_results, results_df)
+        time_stage(timings, 'save', matcher.save_output, results_df)
+        # The memory pass reruns matching on the same matcher; report the first run's counters
+        counters = dict(matcher.stats.counters)
+        memory = measure_matching_memory(matcher, workdir) if args.memory else None
+        in_memory_ok = (check_in_memory(taxonomy_df, semantic_df, synonyms, args, results_df)
+                        if in_memory_check else None)
+
+    result = {
+        'urls': urls,
+        'taxonomy_entries': len(matcher.taxonomy_lookup),
+        'unique_variations': len(matcher.variation_rows),
+        'output_rows': len(results_df),
+        'consolidated_rows': len(consolidated_df),
+        'stages': timings,
+        'total': round(sum(timings.values()), 4),
+        'counters': counters,
+        'peak_memory_mb': peak_memory_mb()
+    }
+    if memory is not None:
+        result['memory'] = memory
+    if in_memory_ok is not None:
+        result['in_memory_matches'] = in_memory_ok
+    return result
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description='NL Taxonomy Mapper V3 - Benchmark with synthetic data'
+    )
+    parser.add_argument('--urls', type=str, default='1000,5000,20000',
+                        help='Comma-separated URL counts to benchmark')
+    parser.add_argument('--keywords-per-row', type=int, default=6,
+                        help='Filled keyword columns per URL (max 10)')
+    parser.add_argument('--taxonomy-rows', type=int, default=40,
+                        help='Segment rows in the synthetic taxonomy')
+    parser.add_argument('--topic-columns', type=int, default=7,
+                        help='Topic columns in the synthetic taxonomy')
+    parser.add_argument('--synonyms', type=int, default=50,
+                        help='Synonym dictionary size')
+    parser.add_argument('--vocabulary', type=int, default=400,
+                        help='Vocabulary size for generated words')
+    parser.add_argument('--language', choices=sorted(LANGUAGES), default='nl',
+                        help='Vocabulary shape')
+    parser.add_argument('-t', '--threshold', type=int, default=80,
+                        help='Similarity threshold')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='Worker processes for matching')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help='URLs matched per chunk (default: config chunk_size)')
+    parser.add_argument('-c', '--country', type=str, default=None,
+                        help='Country whose config settings are used')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('-o', '--output', type=str, default='benchmark_report.json',
+                        help='JSON report path')
+    parser.add_argument('--memory', action='store_true',
+                        help='Also measure heap use of streamed matching against the legacy dedup set')
+    parser.add_argument('--startup', action='store_true',
+                        help=f'Also time --help, --validate-config and --dry-run against '
+                             f'the {STARTUP_BUDGET:.0f}s startup budget (exits 1 when over)')
+    parser.add_argument('--startup-repeats', type=int, default=5,
+                        help='Runs per startup command (median is reported)')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='Show matcher progress output')
+    args = parser.parse_args()
+
+    scales = [int(u) for u in args.urls.split(',') if u.strip()]
+    report = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {k: v for k, v in vars(args).items() if k not in ('output', 'verbose')},
+        'stages': STAGES,
+        'results': []
+    }
+
+    print("=" * 60)
+    print("NL Taxonomy Mapper V3 - Benchmark")
+    print("=" * 60)
+
+    pruning_failures = check_pruning(random.Random(args.seed),
+                                     generate_vocabulary(random.Random(args.seed), args.vocabulary,
+                                                         args.language))
+    report['pruning_lossless'] = not pruning_failures
+    if pruning_failures:
+        print(f"PRUNING MISMATCH: n-gram index drops matches at thresholds {pruning_failures}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for urls in scales:
+            # The in-memory API is checked once, at the first scale
+            result = run_scale(urls, args, workdir, in_memory_check=urls == scales[0])
+            report['results'].append(result)
+            stages = '  '.join(f"{stage} {result['stages'][stage]:.2f}s" for stage in STAGES)
+            print(f"{urls:>8} URLs  {stages}  total {result['total']:.2f}s")
+            if 'memory' in result:
+                memory = result['memory']
+                print(f"{'':>14}streamed matching peak {memory['matching_peak_mb']:.2f} MB  "
+                      f"dedup state {memory['per_url_dedup_mb']:.2f} MB per URL "
+                      f"vs {memory['legacy_dedup_mb']:.2f} MB whole-run")
+            if result.get('in_memory_matches') is False:
+                print(f"{'':>14}IN-MEMORY MISMATCH: run_in_memory() differs from the file run")
+
+    over_budget = []
+    if args.startup:
+        print(f"\nStartup (median of {args.startup_repeats}, budget {STARTUP_BUDGET:.2f}s)")
+        startup = measure_startup(args.startup_repeats, args.country)
+        over_budget = [name for name, seconds in startup.items() if seconds > STARTUP_BUDGET]
+        for name, seconds in startup.items():
+            print(f"  {name:<16} {seconds:.3f}s{'  OVER BUDGET' if name in over_budget else ''}")
+        report['startup'] = {'budget': STARTUP_BUDGET, 'timings': startup,
+                             'within_budget': not over_budget}
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport saved to: {os.path.abspath(args.output)}")
+    in_memory_failed = any(result.get('in_memory_matches') is False
+                           for result in report['results'])
+    if over_budget or in_memory_failed or pruning_failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
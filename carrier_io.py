@@ -0,0 +1,148 @@
+"""
+Semantic Carrier Readers for NL Taxonomy Mapper V3
+Reads Excel, CSV, Parquet and line-delimited JSON inputs in bounded-size chunks
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Iterator, Optional
+
+from lazy_import import lazy_import
+
+pd = lazy_import('pandas')
+
+
+# File extension -> input format
+FORMAT_EXTENSIONS = {
+    '.xlsx': 'excel',
+    '.xlsm': 'excel',
+    '.xls': 'excel',
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl'
+}
+
+SUPPORTED_FORMATS = sorted(set(FORMAT_EXTENSIONS.values()))
+
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    """
+    Determine the input format of a semantic carriers file.
+
+    Args:
+        path: Input file path
+        fmt: Explicit format (excel, csv, parquet, jsonl); detected from the extension if None
+
+    Returns:
+        Format name
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if fmt is None:
+        ext = os.path.splitext(path)[1].lower()
+        fmt = FORMAT_EXTENSIONS.get(ext)
+        if fmt is None:
+            raise ValueError(
+                f"Cannot detect input format of '{path}'. "
+                f"Supported extensions: {', '.join(sorted(FORMAT_EXTENSIONS))}"
+            )
+
+    fmt = fmt.lower()
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(
+            f"Unsupported input format '{fmt}'. Supported: {', '.join(SUPPORTED_FORMATS)}"
+        )
+    return fmt
+
+
+def count_rows(path: str, fmt: str) -> Optional[int]:
+    """
+    Count the URL rows of a semantic carriers file without parsing it (for progress).
+
+    CSV rows are counted as lines, so quoted cells with line breaks make the
+    count an overestimate. Excel workbooks are not counted.
+
+    Args:
+        path: Input file path
+        fmt: Format from detect_format()
+
+    Returns:
+        Number of data rows, or None if it cannot be determined cheaply
+    """
+    if fmt == 'parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            return None
+        return pq.ParquetFile(path).metadata.num_rows
+
+    if fmt not in ('csv', 'jsonl'):
+        return None
+    lines = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                lines += 1
+    # The CSV header line is not a URL
+    return max(0, lines - 1) if fmt == 'csv' else lines
+
+
+def iter_dataframe_chunks(df: pd.DataFrame, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Split an in-memory DataFrame into row-range chunks.
+
+    Args:
+        df: Source DataFrame
+        chunk_size: Maximum rows per chunk
+
+    Yields:
+        Consecutive row slices
+    """
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def iter_semantic_chunks(path: str, fmt: str, chunk_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Stream a semantic carriers file in chunks of at most chunk_size rows.
+
+    CSV, Parquet and JSONL are read incrementally, so memory stays bounded by
+    the chunk size. Excel workbooks have no streaming reader in pandas and
+    are read whole, then sliced.
+
+    Args:
+        path: Input file path
+        fmt: Format from detect_format()
+        chunk_size: Maximum rows per chunk
+
+    Yields:
+        DataFrames with the semantic carriers columns (URL, Keyword 1..10, ...)
+    """
+    if fmt == 'excel':
+        yield from iter_dataframe_chunks(pd.read_excel(path), chunk_size)
+
+    elif fmt == 'csv':
+        # Read every cell as text so keywords like "2024" are not turned into numbers
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=str, encoding='utf-8-sig')
+
+    elif fmt == 'jsonl':
+        with pd.read_json(path, lines=True, chunksize=chunk_size, dtype=False) as reader:
+            yield from reader
+
+    elif fmt == 'parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "Reading Parquet files requires pyarrow. Install it with: pip install pyarrow"
+            )
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+
+    else:
+        raise ValueError(f"Unsupported input format '{fmt}'")
@@ -0,0 +1,124 @@
+"""
+Topic Consolidation for NL Taxonomy Mapper V3
+Vectorized Topic_1..Topic_N layout for collected and streamed output
+"""
+
+from __future__ import annotations
+
+from typing import List, Tuple
+
+from lazy_import import lazy_import
+from output_sink import OUTPUT_COLUMNS, OutputSink
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+
+# Columns identifying one consolidated row
+KEY_COLUMNS = ['URL', 'Product', 'Domain', 'Segment']
+
+
+def topic_columns(count: int) -> List[str]:
+    """Consolidated topic column names Topic_1..Topic_<count>."""
+    return [f'Topic_{i}' for i in range(1, count + 1)]
+
+
+def consolidated_columns(width: int) -> List[str]:
+    """Output columns of consolidated rows with width topic columns."""
+    return KEY_COLUMNS + topic_columns(width)
+
+
+def consolidate_topics(results_df: pd.DataFrame,
+                       split_runs: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Pivot one-row-per-topic results into one row per (URL, Product, Domain, Segment).
+
+    Rows keep the order in which their group first appears (auto-added
+    segment rows included) and topics keep their discovery order. Topics
+    equal to the segment are dropped, as are groups left without topics.
+
+    Args:
+        results_df: DataFrame in one-row-per-topic format
+        split_runs: Consolidate every run of adjacent rows of a URL on its own
+                    instead of merging repeated URLs
+
+    Returns:
+        (consolidated, unmapped): consolidated has the key columns plus
+        Topic_1..Topic_N with N the most topics in any row; unmapped has the
+        key columns of the UNMAPPED rows
+    """
+    is_unmapped = (results_df['Domain'] == 'UNMAPPED').to_numpy()
+    unmapped = results_df.loc[is_unmapped, KEY_COLUMNS]
+    mapped = results_df[~is_unmapped]
+
+    keys = KEY_COLUMNS
+    if split_runs:
+        urls = results_df['URL'].to_numpy(dtype=object)
+        runs = np.cumsum(np.concatenate([[True], urls[1:] != urls[:-1]]))
+        keys = [pd.Series(runs[~is_unmapped], index=mapped.index)] + KEY_COLUMNS
+
+    # Group numbers follow first appearance; then drop segment-as-topic rows
+    groups = mapped.groupby(keys, dropna=False, sort=False).ngroup().to_numpy()
+    topics = mapped['Topic'].to_numpy(dtype=object)
+    keep = topics != mapped['Segment'].to_numpy(dtype=object)
+    groups, topics = groups[keep], topics[keep]
+    key_values = mapped[KEY_COLUMNS].to_numpy(dtype=object)[keep]
+
+    # Position of every topic within its group, and one output row per group
+    slots = pd.Series(groups).groupby(groups, sort=False).cumcount().to_numpy()
+    unique_groups, rows = np.unique(groups, return_inverse=True)
+    width = int(slots.max()) + 1 if len(slots) else 0
+
+    matrix = np.full((len(unique_groups), width), '', dtype=object)
+    matrix[rows, slots] = topics
+    firsts = np.flatnonzero(slots == 0)
+    firsts = firsts[np.argsort(groups[firsts], kind='stable')]
+
+    consolidated = pd.DataFrame(
+        np.hstack([key_values[firsts], matrix]),
+        columns=KEY_COLUMNS + topic_columns(width)
+    ).fillna('')
+    return consolidated, unmapped
+
+
+class ConsolidatingSink(OutputSink):
+    """
+    Consolidates every batch of rows before passing it to another sink.
+
+    The topic column count has to be fixed before the first row is written,
+    so it is the most topics any taxonomy group can produce (see
+    TaxonomyLookup.max_group_topics); trailing topic columns may stay empty.
+    Unmapped URLs are held back and written last, as in collected output.
+    Batches must contain whole URLs, as process_matching() writes them.
+    """
+
+    def __init__(self, sink: OutputSink, width: int):
+        """
+        Args:
+            sink: Destination opened with consolidated_columns(width)
+            width: Number of Topic_i columns
+        """
+        super().__init__(sink.path, OUTPUT_COLUMNS)
+        self.sink = sink
+        self.width = width
+        self.unmapped = []
+        self.max_topics = 0
+
+    def _write(self, rows: List[tuple]):
+        consolidated, unmapped = consolidate_topics(
+            pd.DataFrame(rows, columns=OUTPUT_COLUMNS), split_runs=True
+        )
+        topics = len(consolidated.columns) - len(KEY_COLUMNS)
+        self.max_topics = max(self.max_topics, topics)
+        padding = ('',) * (self.width - topics)
+        self.sink.write_rows([row + padding for row in
+                              consolidated.itertuples(index=False, name=None)])
+        self.unmapped.extend(unmapped.itertuples(index=False, name=None))
+
+    def close(self):
+        """Write the held-back unmapped URLs and finish the destination file."""
+        if self.unmapped:
+            padding = ('',) * self.width
+            self.sink.write_rows([row + padding for row in self.unmapped])
+            self.unmapped = []
+        self.sink.close()
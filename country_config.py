@@ -140,6 +140,22 @@ class CountryConfig:
             'synonyms': str(country_dir / country['files']['synonyms'])
         }
 
+    def get_semantic_format(self, country_code: str) -> Optional[str]:
+        """
+        Get the configured input format of a country's semantic carriers file.
+
+        Args:
+            country_code: Two-letter country code
+
+        Returns:
+            Format name (excel, csv, parquet, jsonl) or None to detect from the extension
+        """
+        if country_code not in self.config['countries']:
+            raise ValueError(f"Country '{country_code}' not found in config")
+
+        files = self.config['countries'][country_code].get('files', {})
+        return files.get('semantic_carriers_format')
+
     def load_synonyms(self, country_code: str) -> Dict[str, List[str]]:
         """
         Load synonyms from JSON file for a country.
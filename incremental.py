@@ -0,0 +1,132 @@
+"""
+Incremental Matching for NL Taxonomy Mapper V3
+Row-hash manifests and previous-output loading for rematching only changed URLs
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+from lazy_import import lazy_import
+from output_sink import OUTPUT_COLUMNS
+
+pd = lazy_import('pandas')
+
+
+MANIFEST_VERSION = 1
+
+
+def row_hash(url: str, keywords: List[str]) -> str:
+    """
+    Hash one semantic carriers row as matching sees it.
+
+    Args:
+        url: URL of the row
+        keywords: Extracted keywords, in column order
+
+    Returns:
+        Hex digest that changes when the URL or any keyword changes
+    """
+    digest = hashlib.sha1(str(url).encode('utf-8'))
+    for keyword in keywords:
+        digest.update(b'\x1f')
+        digest.update(keyword.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def manifest_file(output_file: str) -> str:
+    """Path of the manifest sidecar of an output file."""
+    base, _ = os.path.splitext(output_file)
+    return f'{base}.manifest.json'
+
+
+def load_manifest(path: str) -> Optional[dict]:
+    """
+    Read a manifest written by write_manifest().
+
+    Args:
+        path: Manifest path
+
+    Returns:
+        Manifest dict, or None if the file is missing or from another version
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def write_manifest(path: str, fingerprint: str, row_hashes: Dict[str, str]):
+    """
+    Write the manifest for a finished run.
+
+    Args:
+        path: Manifest path
+        fingerprint: Fingerprint of taxonomy, synonyms, scorer and threshold
+        row_hashes: Dict of URL -> row_hash() of its input row
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': MANIFEST_VERSION,
+            'fingerprint': fingerprint,
+            'rows': row_hashes
+        }, f)
+
+
+def read_output(path: str) -> pd.DataFrame:
+    """
+    Read a previous output file as text.
+
+    Args:
+        path: .xlsx, .csv or .parquet output
+
+    Returns:
+        DataFrame with empty strings for empty cells
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        df = pd.read_csv(path, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+    elif ext in ('.parquet', '.pq'):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_excel(path, dtype=str)
+    return df.fillna('')
+
+
+def load_previous_rows(path: str) -> Dict[str, List[tuple]]:
+    """
+    Load a previous output as one-row-per-topic rows grouped by URL.
+
+    Consolidated outputs (Topic_1, Topic_2, ...) are expanded back to one
+    row per topic; consolidating the spliced rows again reproduces them.
+
+    Args:
+        path: Previous output file
+
+    Returns:
+        Dict of URL -> list of (URL, Product, Domain, Segment, Topic) tuples
+    """
+    df = read_output(path)
+    rows_by_url = {}
+
+    if 'Topic' in df.columns:
+        for row in df[OUTPUT_COLUMNS].itertuples(index=False, name=None):
+            rows_by_url.setdefault(row[0], []).append(row)
+        return rows_by_url
+
+    topic_columns = [col for col in df.columns if col.startswith('Topic_')]
+    keys = df[['URL', 'Product', 'Domain', 'Segment']].itertuples(index=False, name=None)
+    topics = df[topic_columns].itertuples(index=False, name=None)
+    for (url, product, domain, segment), row_topics in zip(keys, topics):
+        rows = rows_by_url.setdefault(url, [])
+        if domain == 'UNMAPPED':
+            rows.append((url, '', 'UNMAPPED', '', ''))
+            continue
+        rows.extend((url, product, domain, segment, topic) for topic in row_topics if topic)
+    return rows_by_url
@@ -0,0 +1,40 @@
+"""
+Lazy Imports for NL Taxonomy Mapper V3
+Defer heavy dependencies (pandas, numpy, fuzzywuzzy) until a stage uses them
+"""
+
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Import a module on first attribute access instead of now.
+
+    The returned module is registered in sys.modules, so later plain imports
+    of the same name share it. `--help`, config validation and dry runs never
+    touch pandas or numpy and start without importing them.
+
+    Args:
+        name: Absolute module name (e.g. 'pandas' or 'fuzzywuzzy.fuzz')
+
+    Returns:
+        The module, loaded lazily where the import system allows it
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None or not hasattr(spec.loader, 'exec_module'):
+        # Loaders without exec_module (some frozen builds) cannot be deferred
+        return importlib.import_module(name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
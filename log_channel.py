@@ -0,0 +1,115 @@
+"""
+Log Channel for NL Taxonomy Mapper V3
+Thread-safe bounded event queue from a worker thread to the GUI main loop
+"""
+
+import queue
+import threading
+import time
+from typing import List, NamedTuple
+
+
+# Events kept before the producer starts dropping log lines
+DEFAULT_MAX_EVENTS = 10000
+
+
+class LogEvent(NamedTuple):
+    """One message from the worker: kind ('log', ...), payload and creation time."""
+    kind: str
+    payload: object
+    created: float
+
+
+class LogChannel:
+    """
+    Bounded queue of LogEvents.
+
+    put() does not block by default: when the consumer falls behind and the
+    queue is full, events are counted and dropped instead of slowing matching
+    down, and drain() reports how many were lost.
+    """
+
+    def __init__(self, max_events: int = DEFAULT_MAX_EVENTS):
+        """
+        Args:
+            max_events: Queue capacity
+        """
+        self.queue = queue.Queue(maxsize=max_events)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def put(self, kind: str, payload, block: bool = False):
+        """
+        Queue an event (safe from any thread).
+
+        Args:
+            kind: Event kind
+            payload: Event data (the message text for 'log')
+            block: Wait for room instead of dropping the event (for events
+                   the consumer must see, never from the consumer's thread)
+        """
+        event = LogEvent(kind, payload, time.time())
+        if block:
+            self.queue.put(event)
+            return
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def log(self, message: str):
+        """Queue a log line."""
+        self.put('log', message)
+
+    def drain(self, max_events: int) -> List[LogEvent]:
+        """
+        Take up to max_events queued events without waiting.
+
+        Args:
+            max_events: Most events to return
+
+        Returns:
+            Events in the order they were queued, followed by a 'log' event
+            about dropped lines if any were dropped since the last drain
+        """
+        events = []
+        try:
+            while len(events) < max_events:
+                events.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            events.append(LogEvent('log', f"... {dropped} log events skipped (log queue full)",
+                                   time.time()))
+        return events
+
+
+class ChannelWriter:
+    """File-like object (for sys.stdout) that queues every complete printed line."""
+
+    def __init__(self, channel: LogChannel):
+        """
+        Args:
+            channel: Channel receiving one 'log' event per non-empty line
+        """
+        self.channel = channel
+        self.buffer = ''
+
+    def write(self, text: str) -> int:
+        self.buffer += text
+        if '\n' in self.buffer:
+            *lines, self.buffer = self.buffer.split('\n')
+            for line in lines:
+                if line.strip():
+                    self.channel.log(line.strip())
+        return len(text)
+
+    def flush(self):
+        """Queue a pending partial line."""
+        if self.buffer.strip():
+            self.channel.log(self.buffer.strip())
+        self.buffer = ''
@@ -0,0 +1,343 @@
+"""
+Matching Service for NL Taxonomy Mapper V3
+Local HTTP server keeping every country's taxonomy lookup warm between requests
+"""
+
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+from country_config import CountryConfig
+from output_sink import OUTPUT_COLUMNS
+from taxonomy_matcher import TaxonomyMatcher
+
+
+class ServiceError(Exception):
+    """Request error reported to the client with an HTTP status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class MatchingService:
+    """Prebuilt matchers per country, shared by all request handler threads."""
+
+    def __init__(self, countries: Optional[List[str]] = None,
+                 similarity_threshold: Optional[int] = None,
+                 config_file: str = 'config.yaml'):
+        """
+        Load the taxonomy of every requested country and build its lookup.
+
+        Countries without a taxonomy file are skipped with a warning.
+
+        Args:
+            countries: Country codes (default: every enabled country)
+            similarity_threshold: Threshold for all countries (default: country config)
+            config_file: Path to config.yaml
+        """
+        country_config = CountryConfig(config_file)
+        if countries is None:
+            countries = [c['code'] for c in country_config.get_available_countries()]
+
+        self.matchers = {}
+        self.locks = {}
+        for code in countries:
+            code = code.upper()
+            taxonomy_file = country_config.get_country_files(code)['taxonomy']
+            if not os.path.exists(taxonomy_file):
+                print(f"Warning: Skipping {code}, taxonomy not found: {taxonomy_file}")
+                continue
+
+            print(f"\nPreparing {code}...")
+            matcher = TaxonomyMatcher(
+                country_code=code,
+                similarity_threshold=similarity_threshold,
+                config_file=config_file
+            )
+            matcher.load_taxonomy()
+            matcher.build_taxonomy_lookup()
+            self.matchers[code] = matcher
+            self.locks[code] = threading.Lock()
+
+        if not self.matchers:
+            raise ValueError("No country with a taxonomy file to serve")
+        self.default_country = (country_config.get_default_country()
+                                if country_config.get_default_country() in self.matchers
+                                else next(iter(self.matchers)))
+
+    def health(self) -> dict:
+        """Service status and the countries being served."""
+        return {
+            'status': 'ok',
+            'default_country': self.default_country,
+            'countries': {
+                code: {
+                    'threshold': matcher.similarity_threshold,
+                    'topics': len(matcher.taxonomy_lookup)
+                }
+                for code, matcher in self.matchers.items()
+            }
+        }
+
+    def match(self, request: dict) -> dict:
+        """
+        Match one URL's keywords.
+
+        Args:
+            request: {"url": ..., "keywords": [...], "country": optional, "threshold": optional}
+
+        Returns:
+            {"url", "country", "threshold", "mapped", "matches": [{Product, Domain, Segment, Topic}]}
+        """
+        return self.match_batch({**request, 'records': [request]})['results'][0]
+
+    def match_batch(self, request: dict) -> dict:
+        """
+        Match many URLs' keywords with one country and threshold.
+
+        Args:
+            request: {"records": [{"url": ..., "keywords": [...]}, ...],
+                      "country": optional, "threshold": optional}
+
+        Returns:
+            {"results": [...]} with one match() result per record, in order
+        """
+        code = str(request.get('country') or self.default_country).upper()
+        matcher = self.matchers.get(code)
+        if matcher is None:
+            raise ServiceError(404, f"Country '{code}' is not served "
+                                    f"(available: {', '.join(self.matchers)})")
+
+        records = request.get('records')
+        if not isinstance(records, list):
+            raise ServiceError(400, "'records' must be a list")
+
+        threshold = request.get('threshold', matcher.similarity_threshold)
+        if not isinstance(threshold, int) or not matcher.score_cutoff <= threshold <= 100:
+            raise ServiceError(400, f"'threshold' must be an integer from "
+                                    f"{matcher.score_cutoff} to 100")
+
+        for record in records:
+            if not isinstance(record, dict) or not isinstance(record.get('keywords'), list):
+                raise ServiceError(400, "Every record needs a 'keywords' list")
+
+        keyword_lists = [[str(kw).strip() for kw in record['keywords'] if kw is not None]
+                         for record in records]
+
+        results = []
+        with self.locks[code]:
+            # Bound memory: scores and keyword results are dropped together
+            # (the score cache, if enabled, still holds the scores on disk)
+            matcher.trim_scores()
+            configured = matcher.similarity_threshold
+            matcher.similarity_threshold = threshold
+            try:
+                # One scoring batch (and one matrix append) for the whole request
+                matcher.score_keywords(kw for keywords in keyword_lists for kw in keywords)
+                for record, keywords in zip(records, keyword_lists):
+                    url = record.get('url', '')
+                    rows = matcher.match_keywords(url, keywords)
+                    mapped = rows[0][2] != 'UNMAPPED'
+                    results.append({
+                        'url': url,
+                        'country': code,
+                        'threshold': threshold,
+                        'mapped': mapped,
+                        'matches': [dict(zip(OUTPUT_COLUMNS[1:], row[1:]))
+                                    for row in rows] if mapped else []
+                    })
+            finally:
+                matcher.similarity_threshold = configured
+
+        return {'results': results}
+
+
+class MatchingRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON endpoints:
+        GET  /health       service status
+        POST /match        one record
+        POST /match/batch  {"records": [...]}
+    """
+
+    service = None  # MatchingService, set by serve()
+
+    def do_GET(self):
+        if self.path == '/health':
+            self.send_json(200, self.service.health())
+        else:
+            self.send_json(404, {'error': f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        routes = {'/match': self.service.match, '/match/batch': self.service.match_batch}
+        route = routes.get(self.path)
+        if route is None:
+            self.send_json(404, {'error': f"Unknown endpoint: {self.path}"})
+            return
+
+        try:
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+            except ValueError:
+                raise ServiceError(400, "Invalid Content-Length header")
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(request, dict):
+                raise ServiceError(400, "Request body must be a JSON object")
+            self.send_json(200, route(request))
+        except json.JSONDecodeError as e:
+            self.send_json(400, {'error': f"Invalid JSON: {e}"})
+        except ServiceError as e:
+            self.send_json(e.status, {'error': str(e)})
+        except Exception as e:
+            self.log_error("Error handling %s: %s", self.path, traceback.format_exc())
+            self.send_json(500, {'error': f"Internal error: {e}"})
+
+    def send_json(self, status: int, body: dict):
+        """Send a JSON response."""
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """Keep request logging quiet unless the server runs with --verbose."""
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def create_server(service: MatchingService, host: str = '127.0.0.1', port: int = 8765,
+                  verbose: bool = False) -> ThreadingHTTPServer:
+    """
+    Bind a server for the service without starting it.
+
+    Args:
+        service: Prepared MatchingService
+        host: Interface to bind (localhost by default)
+        port: TCP port (0 picks a free one, see server.server_port)
+        verbose: Log every request
+
+    Returns:
+        ThreadingHTTPServer ready for serve_forever()
+    """
+    handler = type('Handler', (MatchingRequestHandler,), {'service': service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.verbose = verbose
+    return server
+
+
+def serve(service: MatchingService, host: str = '127.0.0.1', port: int = 8765,
+          verbose: bool = False):
+    """
+    Serve requests until interrupted.
+
+    Args:
+        service: Prepared MatchingService
+        host: Interface to bind (localhost by default)
+        port: TCP port
+        verbose: Log every request
+    """
+    server = create_server(service, host, port, verbose)
+    print(f"\nServing {', '.join(service.matchers)} on http://{host}:{server.server_port}")
+    print("Endpoints: GET /health, POST /match, POST /match/batch (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping server...")
+    finally:
+        server.server_close()
+        for matcher in service.matchers.values():
+            matcher.close_score_cache()
+
+
+def self_check(service: MatchingService) -> bool:
+    """
+    Serve on a free localhost port and exercise every endpoint once.
+
+    Posts one record, whose keyword is the first topic of the default
+    country, to /match and /match/batch and compares both answers with
+    service.match(); also checks /health and the 400 answer to invalid JSON.
+
+    Args:
+        service: Prepared MatchingService
+
+    Returns:
+        True if every endpoint answered as expected
+    """
+    server = create_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def call(method: str, path: str, body: Optional[bytes] = None):
+        connection = http.client.HTTPConnection('127.0.0.1', server.server_port, timeout=60)
+        try:
+            connection.request(method, path, body,
+                               {'Content-Type': 'application/json'} if body is not None else {})
+            response = connection.getresponse()
+            return response.status, json.loads(response.read())
+        finally:
+            connection.close()
+
+    matcher = service.matchers[service.default_country]
+    record = {'url': 'https://example.com/self-check',
+              'keywords': matcher.taxonomy_lookup.topics()[:1]}
+    expected = service.match(record)
+
+    checks = {}
+    try:
+        status, body = call('GET', '/health')
+        checks['GET /health'] = status == 200 and body['status'] == 'ok'
+        status, body = call('POST', '/match', json.dumps(record).encode('utf-8'))
+        checks['POST /match'] = status == 200 and body == expected
+        status, body = call('POST', '/match/batch',
+                            json.dumps({'records': [record]}).encode('utf-8'))
+        checks['POST /match/batch'] = status == 200 and body == {'results': [expected]}
+        status, body = call('POST', '/match', b'{not json')
+        checks['POST invalid JSON -> 400'] = status == 400 and 'error' in body
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print(f"\nSelf-check on http://127.0.0.1:{server.server_port} ({service.default_country}):")
+    for name, ok in checks.items():
+        print(f"  {'OK  ' if ok else 'FAIL'} {name}")
+    return all(checks.values())
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(
+        description='NL Taxonomy Mapper V3 - Local matching service'
+    )
+    parser.add_argument('--countries', type=str, default=None,
+                        help='Comma-separated country codes (default: all enabled countries)')
+    parser.add_argument('-t', '--threshold', type=int, default=None,
+                        help='Similarity threshold for all countries (default: country config)')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Interface to bind')
+    parser.add_argument('-p', '--port', type=int, default=8765, help='TCP port')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Log every request')
+    parser.add_argument('--self-check', action='store_true',
+                        help='Check the endpoints on a free localhost port and exit')
+    args = parser.parse_args()
+
+    countries = [c.strip() for c in args.countries.split(',') if c.strip()] \
+        if args.countries else None
+    service = MatchingService(countries, args.threshold)
+    if args.self_check:
+        ok = self_check(service)
+        for matcher in service.matchers.values():
+            matcher.close_score_cache()
+        sys.exit(0 if ok else 1)
+    serve(service, args.host, args.port, args.verbose)
+
+
+if __name__ == "__main__":
+    main()
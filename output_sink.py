@@ -0,0 +1,181 @@
+"""
+Output Sinks for NL Taxonomy Mapper V3
+Write result rows incrementally to CSV, Parquet or write-only Excel workbooks
+"""
+
+import csv
+import os
+from typing import List, Optional, Sequence
+
+
+# Output columns of the one-row-per-topic format
+OUTPUT_COLUMNS = ['URL', 'Product', 'Domain', 'Segment', 'Topic']
+
+# File extension -> output format
+SINK_EXTENSIONS = {
+    '.xlsx': 'excel',
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet'
+}
+
+
+def detect_sink_format(path: str) -> str:
+    """
+    Determine the output format from a file extension.
+
+    Args:
+        path: Output file path
+
+    Returns:
+        Format name (excel, csv, parquet)
+
+    Raises:
+        ValueError: If the extension has no streaming writer
+    """
+    ext = os.path.splitext(path)[1].lower()
+    fmt = SINK_EXTENSIONS.get(ext)
+    if fmt is None:
+        raise ValueError(
+            f"Cannot stream output to '{path}'. "
+            f"Supported extensions: {', '.join(sorted(SINK_EXTENSIONS))}"
+        )
+    return fmt
+
+
+class OutputSink:
+    """Base class: accepts batches of row tuples and writes them as they arrive."""
+
+    def __init__(self, path: str, columns: Sequence[str] = OUTPUT_COLUMNS):
+        """
+        Open the destination file.
+
+        Args:
+            path: Output file path
+            columns: Column names, in row tuple order
+        """
+        self.path = path
+        self.columns = list(columns)
+        self.rows_written = 0
+
+    def write_rows(self, rows: List[tuple]):
+        """
+        Write a batch of rows.
+
+        Args:
+            rows: Row tuples in column order
+        """
+        if rows:
+            self._write(rows)
+            self.rows_written += len(rows)
+
+    def _write(self, rows: List[tuple]):
+        raise NotImplementedError
+
+    def close(self):
+        """Finish the file. Rows written so far are kept even after an error."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class CsvSink(OutputSink):
+    """CSV sink, flushed after every batch so a crash keeps all earlier rows."""
+
+    def __init__(self, path: str, columns: Sequence[str] = OUTPUT_COLUMNS):
+        super().__init__(path, columns)
+        # utf-8-sig so Excel opens Dutch/Swedish characters correctly
+        self.file = open(path, 'w', encoding='utf-8-sig', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.columns)
+
+    def _write(self, rows: List[tuple]):
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+
+class ParquetSink(OutputSink):
+    """Parquet sink writing one row group per batch (requires pyarrow)."""
+
+    def __init__(self, path: str, columns: Sequence[str] = OUTPUT_COLUMNS):
+        super().__init__(path, columns)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "Writing Parquet files requires pyarrow. Install it with: pip install pyarrow"
+            )
+        self.pa = pa
+        self.schema = pa.schema([(column, pa.string()) for column in self.columns])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def _write(self, rows: List[tuple]):
+        arrays = [self.pa.array(values, type=self.pa.string()) for values in zip(*rows)]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class ExcelSink(OutputSink):
+    """
+    Excel sink using an openpyxl write-only workbook.
+
+    Rows are serialized as they arrive instead of being held as cells, but
+    the xlsx container is only written by close(), which also runs when
+    matching fails part-way.
+    """
+
+    def __init__(self, path: str, columns: Sequence[str] = OUTPUT_COLUMNS,
+                 sheet_name: str = 'Sheet1'):
+        super().__init__(path, columns)
+        from openpyxl import Workbook
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet(sheet_name)
+        self.sheet.append(self.columns)
+
+    def _write(self, rows: List[tuple]):
+        for row in rows:
+            # Empty cells instead of empty strings, as DataFrame.to_excel writes them
+            self.sheet.append([value if value != '' else None for value in row])
+
+    def close(self):
+        if self.workbook is not None:
+            self.workbook.save(self.path)
+            self.workbook = None
+
+
+SINKS = {
+    'csv': CsvSink,
+    'parquet': ParquetSink,
+    'excel': ExcelSink
+}
+
+
+def open_sink(path: str, columns: Sequence[str] = OUTPUT_COLUMNS,
+              fmt: Optional[str] = None) -> OutputSink:
+    """
+    Open a streaming sink for an output file.
+
+    Args:
+        path: Output file path
+        columns: Column names, in row tuple order
+        fmt: Output format (detected from the extension if None)
+
+    Returns:
+        OutputSink for the format
+    """
+    if fmt is None:
+        fmt = detect_sink_format(path)
+    return SINKS[fmt](path, columns)
+
@@ -0,0 +1,206 @@
+"""
+Parallel Matching for NL Taxonomy Mapper V3
+Scores keyword variations and matches row-range shards in a process pool
+"""
+
+import math
+import signal
+from itertools import islice
+from typing import Dict, List, Tuple
+
+from lazy_import import lazy_import
+
+np = lazy_import('numpy')
+
+
+# Upper bound on (variation, topic) pairs per scoring shard (about a second of
+# scoring at low thresholds): workers cannot see the cancel token, so a
+# cancelled run waits for at most one shard per worker
+MAX_SHARD_PAIRS = 20_000
+
+# Prebuilt matchers for this worker process, installed once by init_worker()
+_worker_matchers = {}
+
+
+def init_worker(matchers: Dict[str, object]):
+    """
+    Pool initializer: receive prebuilt matchers once per worker process.
+
+    Args:
+        matchers: Dict of key (country code) -> TaxonomyMatcher with lookup built
+    """
+    global _worker_matchers
+    _worker_matchers = matchers
+    # Ctrl-C is handled by the parent, which cancels the run and stops the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for matcher in matchers.values():
+        # The SQLite score cache stays with the parent process
+        matcher.score_cache = None
+
+
+def _counter_snapshot(matcher) -> Tuple[Tuple[int, ...], Dict[str, int]]:
+    """Counters of a worker matcher, to be diffed by _counter_deltas()."""
+    index = matcher.ngram_index
+    return ((matcher.cache_hits, matcher.cache_misses, index.pairs_total, index.pairs_scored,
+             index.pairs_bounded), dict(matcher.stats.counters))
+
+
+def _counter_deltas(matcher, snapshot: Tuple[Tuple[int, ...], Dict[str, int]]) -> Dict:
+    """Counter changes of a worker matcher since snapshot, for merge_counters()."""
+    before, stats_before = snapshot
+    index = matcher.ngram_index
+    return {
+        'cache_hits': matcher.cache_hits - before[0],
+        'cache_misses': matcher.cache_misses - before[1],
+        'pairs_total': index.pairs_total - before[2],
+        'pairs_scored': index.pairs_scored - before[3],
+        'pairs_bounded': index.pairs_bounded - before[4],
+        'stats': {
+            name: value - stats_before.get(name, 0)
+            for name, value in matcher.stats.counters.items()
+        }
+    }
+
+
+def merge_counters(matcher, counters: Dict):
+    """
+    Add a worker's counter deltas to the parent matcher.
+
+    Args:
+        matcher: Parent TaxonomyMatcher
+        counters: Counter deltas from a worker task
+    """
+    matcher.cache_hits += counters['cache_hits']
+    matcher.cache_misses += counters['cache_misses']
+    matcher.ngram_index.pairs_total += counters['pairs_total']
+    matcher.ngram_index.pairs_scored += counters['pairs_scored']
+    matcher.ngram_index.pairs_bounded += counters['pairs_bounded']
+    matcher.stats.merge_counters(counters['stats'])
+
+
+def score_shard(task: Tuple[str, List[str], int]) -> Tuple[object, Dict]:
+    """
+    Score one shard of keyword variations in a worker process.
+
+    Args:
+        task: (matcher key, variations, score cut-off of the parent)
+
+    Returns:
+        (score matrix with one row per variation, counter deltas)
+    """
+    key, variations, score_cutoff = task
+    matcher = _worker_matchers[key]
+    matcher.score_cutoff = score_cutoff
+
+    snapshot = _counter_snapshot(matcher)
+    scores = matcher.compute_scores(variations)
+    return scores, _counter_deltas(matcher, snapshot)
+
+
+def score_in_pool(pool, key: str, matcher, variations: List[str], workers: int,
+                  cancel_token=None):
+    """
+    Score variations across a process pool.
+
+    The parent passes only variations it holds no scores for, so no
+    variation is scored twice; workers keep nothing between tasks.
+
+    Args:
+        pool: multiprocessing Pool initialized with init_worker()
+        key: Key of the matcher inside the workers
+        matcher: Parent TaxonomyMatcher (receives the workers' counters)
+        variations: Unique unscored keyword variations
+        workers: Number of worker processes (used to size shards)
+        cancel_token: Optional CancellationToken checked after every shard
+
+    Returns:
+        Score matrix with one row per variation, in input order
+
+    Raises:
+        MatchCancelled: If cancel_token is cancelled while shards are running
+    """
+    # Several shards per worker keeps the pool balanced when variations differ in cost
+    shard_size = max(1, min(math.ceil(len(variations) / (workers * 4)),
+                            MAX_SHARD_PAIRS // max(1, len(matcher.topic_choices))))
+    tasks = [(key, variations[start:start + shard_size], matcher.score_cutoff)
+             for start in range(0, len(variations), shard_size)]
+
+    shards = []
+    for scores, counters in pool.imap(score_shard, tasks):
+        shards.append(scores)
+        merge_counters(matcher, counters)
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+
+    return np.vstack(shards)
+
+
+def match_shard(task: Tuple[str, List[List[str]], Dict]) -> Tuple[List[List[int]], Dict, Dict]:
+    """
+    Match one shard of URL keyword lists in a worker process.
+
+    The shard's variations are scored in one batch before its rows are matched.
+
+    Args:
+        task: (matcher key, keyword lists for a contiguous row range,
+               score rows the parent already holds for the shard's variations)
+
+    Returns:
+        (per-row entry indices, newly scored variation rows, counter deltas)
+    """
+    key, keyword_rows, known_rows = task
+    matcher = _worker_matchers[key]
+
+    # Worker matchers live as long as the pool; keep their scores bounded too
+    matcher.trim_scores()
+    matcher.add_score_rows(known_rows)
+
+    known = len(matcher.variation_rows)
+    snapshot = _counter_snapshot(matcher)
+
+    matcher.score_variations(
+        variation for keyword in dict.fromkeys(kw for keywords in keyword_rows for kw in keywords)
+        for variation in matcher.expand_with_synonyms(keyword)
+    )
+    url_matches = [matcher.match_url(keywords) for keywords in keyword_rows]
+
+    new_rows = {
+        variation: matcher.score_matrix[matcher.variation_rows[variation]]
+        for variation in islice(matcher.variation_rows, known, None)
+    }
+    return url_matches, new_rows, _counter_deltas(matcher, snapshot)
+
+
+def shard_task(key: str, matcher,
+               keyword_rows: List[List[str]]) -> Tuple[str, List[List[str]], Dict]:
+    """
+    Build a match_shard() task carrying the score rows the parent already holds.
+
+    Args:
+        key: Key of the matcher inside the workers
+        matcher: Parent TaxonomyMatcher
+        keyword_rows: Keyword lists of the shard
+
+    Returns:
+        Task tuple for match_shard()
+    """
+    known_rows = matcher.known_score_rows(
+        variation for keywords in keyword_rows for keyword in keywords
+        for variation in matcher.expand_with_synonyms(keyword)
+    )
+    return key, keyword_rows, known_rows
+
+
+def merge_shard(matcher, new_rows: Dict, counters: Dict):
+    """
+    Apply a shard's newly scored rows and counters to the parent matcher.
+
+    Args:
+        matcher: Parent TaxonomyMatcher
+        new_rows: Variation -> score row computed by the worker
+        counters: Counter deltas from match_shard()
+    """
+    matcher.add_score_rows(new_rows)
+    if matcher.score_cache is not None and new_rows:
+        matcher.score_cache.store(new_rows.items(), matcher.score_cutoff)
+    merge_counters(matcher, counters)
@@ -0,0 +1,99 @@
+"""
+Progress and Cancellation for NL Taxonomy Mapper V3
+Throttled progress reports (done, rate, ETA) and a cooperative cancellation token
+"""
+
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+
+class MatchCancelled(Exception):
+    """Raised inside matching when its CancellationToken has been cancelled."""
+
+
+class CancellationToken:
+    """Thread-safe flag a GUI or signal handler sets to stop a run between URL batches."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Request cancellation (safe from any thread or signal handler)."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """True once cancel() has been called."""
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        """
+        Raises:
+            MatchCancelled: If cancellation was requested
+        """
+        if self._event.is_set():
+            raise MatchCancelled("Matching was cancelled")
+
+
+class ProgressReport(NamedTuple):
+    """Matching progress at one point of a run."""
+    done: int                 # URLs processed so far
+    total: Optional[int]      # URLs in the input (None if unknown)
+    rate: float               # URLs per second since matching started
+    eta: Optional[float]      # Seconds remaining (None if unknown)
+
+
+def format_progress(report: ProgressReport) -> str:
+    """
+    One-line description of a progress report.
+
+    Args:
+        report: Progress report
+
+    Returns:
+        Text like "Processed 500/2000 URLs (250 URLs/s, ETA 0:06)"
+    """
+    done = f"{report.done}/{report.total}" if report.total else f"{report.done}"
+    text = f"Processed {done} URLs ({report.rate:.0f} URLs/s"
+    if report.eta is not None:
+        minutes, seconds = divmod(int(round(report.eta)), 60)
+        text += f", ETA {minutes}:{seconds:02d}"
+    return text + ")"
+
+
+class ProgressTracker:
+    """Turns per-URL updates into a callback every `interval` URLs."""
+
+    def __init__(self, callback: Callable[[ProgressReport], None],
+                 total: Optional[int], interval: int):
+        """
+        Args:
+            callback: Receives a ProgressReport every interval URLs and at the end
+            total: URLs in the input, if known
+            interval: URLs between reports (progress_update_interval)
+        """
+        self.callback = callback
+        self.total = total
+        self.interval = max(1, int(interval))
+        self.start = time.perf_counter()
+        self.next_report = self.interval
+
+    def update(self, done: int, final: bool = False):
+        """
+        Report progress if another interval has passed (or final is set).
+
+        Args:
+            done: URLs processed so far
+            final: Report regardless of the interval
+        """
+        if done < self.next_report and not final:
+            return
+        self.next_report = (done // self.interval + 1) * self.interval
+
+        elapsed = time.perf_counter() - self.start
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if self.total and rate > 0:
+            eta = max(0, self.total - done) / rate
+        self.callback(ProgressReport(done, self.total, rate, eta))
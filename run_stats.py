@@ -0,0 +1,162 @@
+"""
+Run Statistics for NL Taxonomy Mapper V3
+Per-stage wall/CPU timings and work counters for a matching run
+"""
+
+import functools
+import json
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+# Counters every run reports (missing ones are shown as 0)
+COUNTERS = [
+    'urls',
+    'urls_reused',
+    'keywords',
+    'synonym_expansions',
+    'fuzzy_comparisons',
+    'pairs_pruned',
+    'pairs_pruned_bound',
+    'keyword_cache_hits',
+    'keyword_cache_misses',
+    'score_cache_rows',
+    'rows_emitted',
+    'dedup_rejections',
+    'matches_capped'
+]
+
+
+def peak_memory_mb() -> Optional[float]:
+    """
+    Peak resident memory of this process.
+
+    Returns:
+        Peak RSS in MB, or None where the resource module is unavailable (Windows)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and KiB elsewhere
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def timed_stage(name: str):
+    """
+    Decorator timing a TaxonomyMatcher method as a stage of self.stats.
+
+    Args:
+        name: Stage name
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.stats.stage(name):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class RunStats:
+    """Collects stage timings and counters; exposed as TaxonomyMatcher.stats."""
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.stages = {}
+        self.counters = {name: 0 for name in COUNTERS}
+        self._open_stages = []  # [child wall, child cpu] per stage being timed
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Time a block as a named stage.
+
+        Repeated stages accumulate. Time spent in a nested stage is only
+        counted for the inner stage, so stage times add up to the run time.
+
+        Args:
+            name: Stage name (load, lookup, matching, consolidation, save)
+        """
+        children = [0.0, 0.0]
+        self._open_stages.append(children)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            self._open_stages.pop()
+            if self._open_stages:
+                self._open_stages[-1][0] += wall
+                self._open_stages[-1][1] += cpu
+
+            entry = self.stages.setdefault(name, {'wall': 0.0, 'cpu': 0.0, 'calls': 0})
+            entry['wall'] += wall - children[0]
+            entry['cpu'] += cpu - children[1]
+            entry['calls'] += 1
+
+    def count(self, name: str, amount: int = 1):
+        """
+        Increase a counter.
+
+        Args:
+            name: Counter name
+            amount: Increment
+        """
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge_counters(self, counters: Dict[str, int]):
+        """
+        Add counters collected elsewhere (e.g. in worker processes).
+
+        Args:
+            counters: Dict of counter name -> increment
+        """
+        for name, amount in counters.items():
+            self.count(name, amount)
+
+    def to_dict(self, **metadata) -> dict:
+        """
+        Export statistics as a JSON-serializable dict.
+
+        Args:
+            **metadata: Extra top-level fields (country, threshold, ...)
+
+        Returns:
+            Dict with metadata, stages, counters and peak memory
+        """
+        return {
+            **metadata,
+            'stages': {
+                name: {
+                    'wall_seconds': round(entry['wall'], 4),
+                    'cpu_seconds': round(entry['cpu'], 4),
+                    'calls': entry['calls']
+                }
+                for name, entry in self.stages.items()
+            },
+            'counters': dict(self.counters),
+            'peak_memory_mb': peak_memory_mb()
+        }
+
+    def write_json(self, path: str, **metadata):
+        """
+        Write statistics to a JSON file.
+
+        Args:
+            path: Destination path
+            **metadata: Extra top-level fields
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(**metadata), f, indent=2)
+
+    def summary(self) -> str:
+        """One-line stage timing summary for console output."""
+        return '  '.join(
+            f"{name} {entry['wall']:.2f}s" for name, entry in self.stages.items()
+        )
@@ -0,0 +1,167 @@
+"""
+Persistent Score Cache for NL Taxonomy Mapper V3
+Stores keyword x topic scores in SQLite so reruns only need to filter
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lazy_import import lazy_import
+from scoring import SCORER_VERSION
+
+np = lazy_import('numpy')
+
+
+# SQLite limits the number of bound parameters per statement
+_QUERY_CHUNK_SIZE = 500
+
+
+def file_digest(path: Optional[str]) -> str:
+    """
+    Compute the SHA-256 digest of a file's contents.
+
+    Args:
+        path: File path (a missing file hashes as empty content)
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    if path and os.path.exists(path):
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def data_digest(data: bytes) -> str:
+    """
+    Compute the SHA-256 digest of in-memory data (used instead of a file digest).
+
+    Args:
+        data: Serialized data
+
+    Returns:
+        Hex digest string
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def compute_fingerprint(taxonomy_file: str, synonyms_file: Optional[str],
+                        taxonomy_digest: Optional[str] = None,
+                        synonyms_digest: Optional[str] = None) -> str:
+    """
+    Build the cache key for a taxonomy/synonyms/scorer combination.
+
+    Args:
+        taxonomy_file: Path to taxonomy file
+        synonyms_file: Path to synonyms JSON (may be missing)
+        taxonomy_digest: Digest of in-memory taxonomy data (replaces the file digest)
+        synonyms_digest: Digest of in-memory synonyms (replaces the file digest)
+
+    Returns:
+        Hex fingerprint that changes whenever either input or the scorer changes
+    """
+    digest = hashlib.sha256()
+    digest.update((taxonomy_digest or file_digest(taxonomy_file)).encode())
+    digest.update((synonyms_digest or file_digest(synonyms_file)).encode())
+    digest.update(SCORER_VERSION.encode())
+    return digest.hexdigest()
+
+
+class ScoreCache:
+    """
+    SQLite-backed store of score rows, one row per keyword variation.
+
+    Each row records the score cut-off it was computed with: scores below it
+    may have been pruned to 0, so the row is only valid for thresholds at or
+    above that cut-off.
+    """
+
+    def __init__(self, cache_file: str, country_code: str, fingerprint: str):
+        """
+        Open (or create) the cache for one country.
+
+        Rows stored under an older fingerprint for the same country are
+        dropped, so edits to the taxonomy or synonyms invalidate the cache.
+
+        Args:
+            cache_file: Path to SQLite database file
+            country_code: Two-letter country code
+            fingerprint: Value from compute_fingerprint()
+        """
+        self.cache_file = cache_file
+        self.country_code = country_code
+        self.fingerprint = fingerprint
+
+        # Callers serialize access; the matching service uses it from handler threads
+        self.conn = sqlite3.connect(cache_file, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS fingerprints ("
+                "country TEXT PRIMARY KEY, fingerprint TEXT NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                "fingerprint TEXT NOT NULL, variation TEXT NOT NULL, "
+                "cutoff INTEGER NOT NULL, scores BLOB NOT NULL, "
+                "PRIMARY KEY (fingerprint, variation))"
+            )
+
+            row = self.conn.execute(
+                "SELECT fingerprint FROM fingerprints WHERE country = ?", (country_code,)
+            ).fetchone()
+            if row is not None and row[0] != fingerprint:
+                self.conn.execute("DELETE FROM scores WHERE fingerprint = ?", (row[0],))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO fingerprints (country, fingerprint) VALUES (?, ?)",
+                (country_code, fingerprint)
+            )
+
+    def load(self, variations: List[str], cutoff: int) -> Dict[str, np.ndarray]:
+        """
+        Fetch cached score rows usable at a score cut-off.
+
+        Args:
+            variations: Keyword variations to look up
+            cutoff: Score cut-off the caller will apply
+
+        Returns:
+            Dict of variation -> score row for every usable cached variation
+        """
+        found = {}
+        for start in range(0, len(variations), _QUERY_CHUNK_SIZE):
+            chunk = variations[start:start + _QUERY_CHUNK_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            cursor = self.conn.execute(
+                f"SELECT variation, scores FROM scores "
+                f"WHERE fingerprint = ? AND cutoff <= ? AND variation IN ({placeholders})",
+                (self.fingerprint, cutoff, *chunk)
+            )
+            for variation, blob in cursor:
+                found[variation] = np.frombuffer(blob, dtype=np.int16)
+        return found
+
+    def store(self, rows: Iterable[Tuple[str, np.ndarray]], cutoff: int):
+        """
+        Persist score rows.
+
+        Args:
+            rows: Iterable of (variation, score row) pairs
+            cutoff: Score cut-off the rows were computed with
+        """
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO scores (fingerprint, variation, cutoff, scores) "
+                "VALUES (?, ?, ?, ?)",
+                ((self.fingerprint, variation, cutoff, scores.astype(np.int16).tobytes())
+                 for variation, scores in rows)
+            )
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
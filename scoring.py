@@ -0,0 +1,338 @@
+"""
+Batch Scoring Engine for NL Taxonomy Mapper V3
+Scores keyword variations against taxonomy topics as one all-pairs matrix
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from lazy_import import lazy_import
+
+np = lazy_import('numpy')
+fuzz = lazy_import('fuzzywuzzy.fuzz')
+
+
+# Bump whenever the scorer or its preprocessing changes (invalidates cached scores)
+SCORER_VERSION = 'fuzzywuzzy.partial_ratio/1'
+
+# Query x choice pairs per bound_mask() block in cdist (bounds its memory and the
+# time between two check() calls)
+BOUND_BLOCK_PAIRS = 1_000_000
+
+
+def ngrams(text: str, n: int) -> Counter:
+    """
+    Count the character n-grams of a string.
+
+    Args:
+        text: Input string
+        n: Gram length
+
+    Returns:
+        Counter of n-gram -> occurrences
+    """
+    return Counter(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+@lru_cache(maxsize=None)
+def min_shared_ngrams(length: int, threshold: int, n: int) -> int:
+    """
+    Lower bound on the n-grams two strings must share to reach a partial_ratio threshold.
+
+    partial_ratio aligns the shorter string s (length m) with windows W of the
+    longer string (|W| <= m) and scores 2*LCS(s, W) / (m + |W|). Turning s into
+    W deletes m - LCS characters of s (each breaks at most n of its n-grams)
+    and inserts |W| - LCS characters (each breaks at most n - 1), so s and W -
+    and therefore s and the longer string - share at least
+    (m - n + 1) - n*(m - LCS) - (n - 1)*(|W| - LCS) n-grams. The bound is the
+    minimum of that over every window length and LCS whose rounded score
+    could still reach the threshold.
+
+    Args:
+        length: Length of the shorter string
+        threshold: Similarity threshold (0-100)
+        n: Gram length
+
+    Returns:
+        Minimum multiset n-gram overlap (0 or less means no pruning is possible)
+    """
+    required = None
+    for window in range(1, length + 1):
+        # Smallest LCS whose score rounds to >= threshold: 2*LCS/(m+w) >= (threshold-0.5)/100
+        lcs = max(0, math.ceil((2 * threshold - 1) * (length + window) / 400))
+        if lcs > window:
+            continue
+        shared = (length - n + 1) - n * (length - lcs) - (n - 1) * (window - lcs)
+        required = shared if required is None else min(required, shared)
+
+    if required is None:
+        # Empty string scores 0
+        return 0 if threshold <= 0 else 1
+    return required
+
+
+def bound_rejects(common: np.ndarray, shorter: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Pairs whose partial_ratio cannot reach a threshold given their shared characters.
+
+    partial_ratio scores 2*M / (m + |W|) for the shorter string (length m)
+    against windows W of the longer one, where the M matched characters
+    cannot exceed the multiset character intersection H of the two strings.
+    Over all window lengths that is at most 2*H / (m + H), so the pair is
+    rejected when 100 times that cannot round up to the threshold. This also
+    covers the length constraint: H <= m, and H = 0 for strings without a
+    shared character.
+
+    Args:
+        common: Character multiset intersection of every pair
+        shorter: Length of the shorter string of every pair
+        threshold: Similarity threshold (0-100)
+
+    Returns:
+        Boolean array, True where the pair can be skipped
+    """
+    common = common.astype(np.int64)
+    return 400 * common < (2 * threshold - 1) * (shorter + common)
+
+
+class NGramIndex:
+    """Inverted character n-gram index over taxonomy topics for candidate pruning."""
+
+    def __init__(self, choices: Sequence[str], n: int = 2):
+        """
+        Build the index.
+
+        Args:
+            choices: Lowercased taxonomy topics (score matrix columns)
+            n: Gram length (bigrams prune best at the usual 75-95 thresholds)
+        """
+        self.n = n
+        self.lengths = np.array([len(choice) for choice in choices], dtype=np.intp)
+        self.pairs_total = 0
+        self.pairs_bounded = 0  # Rejected by the character histogram bound
+        self.pairs_scored = 0
+
+        # Character histogram of every choice (one row per character)
+        self.alphabet = {ch: i for i, ch in
+                         enumerate(sorted({ch for choice in choices for ch in choice}))}
+        self.char_counts = np.zeros((len(self.alphabet), len(choices)), dtype=np.int32)
+        for column, choice in enumerate(choices):
+            for ch, count in Counter(choice).items():
+                self.char_counts[self.alphabet[ch], column] = count
+
+        postings = {}
+        for column, choice in enumerate(choices):
+            for gram, count in ngrams(choice, n).items():
+                postings.setdefault(gram, []).append((column, count))
+
+        self.postings = {
+            gram: (np.array([c for c, _ in entries], dtype=np.intp),
+                   np.array([k for _, k in entries], dtype=np.int32))
+            for gram, entries in postings.items()
+        }
+        self._required = {}
+
+    @classmethod
+    def from_arrays(cls, choices: Sequence[str], n: int, alphabet: Sequence[str],
+                    char_counts: np.ndarray, grams: Sequence[str], posting_offsets: np.ndarray,
+                    posting_columns: np.ndarray, posting_counts: np.ndarray) -> NGramIndex:
+        """
+        Rebuild an index from its saved arrays (see posting_arrays()).
+
+        Args:
+            choices: Lowercased taxonomy topics the index was built over
+            n: Gram length
+            alphabet: Characters of the char_counts rows, in row order
+            char_counts: Character histogram of every choice (alphabet x choices)
+            grams: Indexed n-grams, in posting order
+            posting_offsets: Start of every gram's postings (len(grams) + 1 entries)
+            posting_columns: Choice column of every posting
+            posting_counts: Occurrences of the gram in that choice
+
+        Returns:
+            NGramIndex equal to the one the arrays were saved from
+        """
+        index = cls.__new__(cls)
+        index.n = n
+        index.lengths = np.array([len(choice) for choice in choices], dtype=np.intp)
+        index.pairs_total = 0
+        index.pairs_bounded = 0
+        index.pairs_scored = 0
+        index.alphabet = {ch: i for i, ch in enumerate(alphabet)}
+        index.char_counts = char_counts
+        bounds = np.asarray(posting_offsets).tolist()
+        index.postings = {
+            gram: (posting_columns[start:end], posting_counts[start:end])
+            for gram, start, end in zip(grams, bounds, bounds[1:])
+        }
+        index._required = {}
+        return index
+
+    def posting_arrays(self) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Flatten the postings for saving.
+
+        Returns:
+            (grams, posting_offsets, posting_columns, posting_counts) as
+            taken by from_arrays()
+        """
+        grams = list(self.postings)
+        lengths = [len(self.postings[gram][0]) for gram in grams]
+        offsets = np.zeros(len(grams) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        if grams:
+            columns = np.concatenate([self.postings[gram][0] for gram in grams])
+            counts = np.concatenate([self.postings[gram][1] for gram in grams])
+        else:
+            columns = np.zeros(0, dtype=np.intp)
+            counts = np.zeros(0, dtype=np.int32)
+        return grams, offsets, columns, counts
+
+    def required_overlap(self, threshold: int) -> np.ndarray:
+        """
+        Minimum shared n-grams indexed by shorter-string length.
+
+        Args:
+            threshold: Similarity threshold
+
+        Returns:
+            Array where element m is min_shared_ngrams(m, threshold, n)
+        """
+        if threshold not in self._required:
+            max_length = int(self.lengths.max(initial=0))
+            self._required[threshold] = np.array(
+                [min_shared_ngrams(m, threshold, self.n) for m in range(max_length + 1)],
+                dtype=np.int32
+            )
+        return self._required[threshold]
+
+    def bound_mask(self, queries: Sequence[str], threshold: int) -> np.ndarray:
+        """
+        Cheap pre-filter of a batch of queries against every choice.
+
+        Computes the character multiset intersection of all pairs at once
+        (one vectorized pass per character the queries use) and applies
+        bound_rejects().
+
+        Args:
+            queries: Keyword variations
+            threshold: Similarity threshold
+
+        Returns:
+            Boolean matrix (queries x choices), True where the pair could
+            still reach the threshold
+        """
+        counts = np.zeros((len(queries), len(self.alphabet)), dtype=np.int32)
+        for row, query in enumerate(queries):
+            for ch, count in Counter(query).items():
+                position = self.alphabet.get(ch)
+                if position is not None:
+                    counts[row, position] = count
+
+        common = np.zeros((len(queries), len(self.lengths)), dtype=np.int32)
+        for position in np.flatnonzero(counts.any(axis=0)):
+            common += np.minimum(counts[:, position, None], self.char_counts[position])
+
+        query_lengths = np.array([len(query) for query in queries], dtype=np.intp)
+        shorter = np.minimum(self.lengths, query_lengths[:, None])
+        allowed = ~bound_rejects(common, shorter, threshold)
+
+        self.pairs_bounded += allowed.size - int(allowed.sum())
+        return allowed
+
+    def candidates(self, query: str, threshold: int,
+                   allowed: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Columns whose partial_ratio against the query could reach the threshold.
+
+        Args:
+            query: Keyword variation
+            threshold: Similarity threshold
+            allowed: Optional row of bound_mask() for the query; columns it
+                     rejects are skipped
+
+        Returns:
+            Sorted array of candidate column indices
+        """
+        self.pairs_total += len(self.lengths)
+        if allowed is not None and not allowed.any():
+            return np.zeros(0, dtype=np.intp)
+
+        shared = np.zeros(len(self.lengths), dtype=np.int32)
+        for gram, count in ngrams(query, self.n).items():
+            posting = self.postings.get(gram)
+            if posting is not None:
+                columns, counts = posting
+                shared[columns] += np.minimum(counts, count)
+
+        shorter = np.minimum(self.lengths, len(query))
+        keep = shared >= self.required_overlap(threshold)[shorter]
+        if allowed is not None:
+            keep &= allowed
+        candidates = np.flatnonzero(keep)
+
+        self.pairs_scored += len(candidates)
+        return candidates
+
+
+def cdist(queries: Sequence[str],
+          choices: Sequence[str],
+          scorer: Optional[Callable[[str, str], int]] = None,
+          score_cutoff: int = 0,
+          index: Optional[NGramIndex] = None,
+          check: Optional[Callable[[], None]] = None) -> np.ndarray:
+    """
+    Compute the similarity of every query against every choice.
+
+    Each (query, choice) pair is scored exactly once, so callers should pass
+    de-duplicated queries and choices. With an n-gram index, pairs that
+    provably cannot reach score_cutoff (by their character histograms,
+    checked in bulk per block of queries first, or their n-gram overlap)
+    are skipped and stored as 0.
+
+    Args:
+        queries: Keyword variations (matrix rows)
+        choices: Lowercased taxonomy topics (matrix columns)
+        scorer: Similarity function returning an integer score 0-100
+                (default: fuzz.partial_ratio)
+        score_cutoff: Scores below this value are stored as 0
+        index: Optional NGramIndex built over choices
+        check: Optional callable run before every query row; raising from it
+               (e.g. CancellationToken.raise_if_cancelled) stops the scoring
+
+    Returns:
+        Integer score matrix with shape (len(queries), len(choices))
+    """
+    if scorer is None:
+        scorer = fuzz.partial_ratio
+    rows, cols = len(queries), len(choices)
+
+    matrix = np.zeros((rows, cols), dtype=np.int16)
+    if index is None or score_cutoff <= 0:
+        for row, query in enumerate(queries):
+            if check is not None:
+                check()
+            matrix[row] = np.fromiter((scorer(query, choice) for choice in choices),
+                                      dtype=np.int16, count=cols)
+    else:
+        block = max(1, BOUND_BLOCK_PAIRS // max(1, cols))
+        for start in range(0, rows, block):
+            if check is not None:
+                check()
+            block_queries = queries[start:start + block]
+            allowed = index.bound_mask(block_queries, score_cutoff)
+            for offset, query in enumerate(block_queries):
+                if check is not None:
+                    check()
+                columns = index.candidates(query, score_cutoff, allowed[offset])
+                matrix[start + offset, columns] = [scorer(query, choices[column])
+                                                   for column in columns]
+
+    if score_cutoff > 0:
+        matrix[matrix < score_cutoff] = 0
+
+    return matrix
@@ -0,0 +1,86 @@
+"""
+Synonym Matcher for NL Taxonomy Mapper V3
+Aho-Corasick automaton over synonym keys for single-pass keyword expansion
+"""
+
+from collections import deque
+from typing import Dict, List, Set
+
+
+class SynonymMatcher:
+    """Finds every synonym key occurring in a keyword in one pass over the keyword."""
+
+    def __init__(self, synonyms: Dict[str, List[str]]):
+        """
+        Compile synonym keys into an Aho-Corasick automaton.
+
+        Args:
+            synonyms: Synonym mapping as returned by CountryConfig.load_synonyms()
+        """
+        self.synonyms = synonyms
+
+        # Trie: goto[state] maps a character to the next state
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [set()]
+
+        for key in synonyms:
+            state = 0
+            for char in key:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append(set())
+                state = next_state
+            self.outputs[state].add(key)
+
+        # Breadth-first failure links; each state inherits its fallback's outputs
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.outputs[next_state] |= self.outputs[self.fail[next_state]]
+
+    def find_keys(self, text: str) -> Set[str]:
+        """
+        Find all synonym keys that occur as substrings of text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of matching keys (an empty key matches any text)
+        """
+        found = set(self.outputs[0])
+        state = 0
+        for char in text:
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            if self.outputs[state]:
+                found |= self.outputs[state]
+        return found
+
+    def expand(self, keyword: str) -> List[str]:
+        """
+        Expand a keyword with the synonyms of every key it contains.
+
+        Args:
+            keyword: Original keyword
+
+        Returns:
+            List of unique keyword variations including synonyms
+        """
+        lowered = keyword.lower()
+        variations = [lowered.strip()]
+        for key in self.find_keys(lowered):
+            variations.extend(self.synonyms[key])
+        return list(dict.fromkeys(variations))
@@ -0,0 +1,206 @@
+"""
+Compiled Taxonomy for NL Taxonomy Mapper V3
+Versioned binary taxonomy lookup, memory-mapped instead of re-reading the workbook
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+from typing import Dict, List, Optional
+
+from lazy_import import lazy_import
+from scoring import NGramIndex
+from taxonomy_lookup import TaxonomyLookup
+
+np = lazy_import('numpy')
+
+
+# Bump whenever the layout or the taxonomy normalization changes
+ARTIFACT_VERSION = 2
+
+# File starts with the magic and the header length; arrays follow the JSON header
+_MAGIC = b'NLMAPTAX'
+_PREFIX = struct.Struct('<8sQ')
+
+# Array offsets are aligned so every array can be memory-mapped directly
+_ALIGNMENT = 64
+
+# Lookup and n-gram index arrays stored in the artifact, with their on-disk dtype
+# (char_counts is stored flattened, alphabet x topic_choices)
+_ARRAYS = {
+    'product_ids': '<i4',
+    'domain_ids': '<i4',
+    'segment_ids': '<i4',
+    'topic_ids': '<i4',
+    'group_ids': '<i8',
+    'topic_index': '<i8',
+    'char_counts': '<i4',
+    'posting_offsets': '<i8',
+    'posting_columns': '<i8',
+    'posting_counts': '<i4'
+}
+
+
+def artifact_file(taxonomy_file: str) -> str:
+    """Path of the compiled artifact of a taxonomy workbook (next to it)."""
+    base, _ = os.path.splitext(taxonomy_file)
+    return f'{base}.compiled.bin'
+
+
+class TaxonomyArtifact:
+    """Taxonomy lookup, score matrix columns and n-gram index loaded from a compiled artifact."""
+
+    def __init__(self, header: dict, arrays: Dict[str, np.ndarray]):
+        """
+        Args:
+            header: Artifact header (version, source digests, strings, topics, grams)
+            arrays: Lookup arrays by name (memory-mapped when loaded from disk)
+        """
+        self.header = header
+        self.taxonomy_digest = header['taxonomy_digest']
+        self.synonyms_digest = header['synonyms_digest']
+        self.topic_columns = header['topic_columns']
+        self.topic_choices = header['topic_choices']
+        self.topic_index = arrays['topic_index']
+        self.lookup = TaxonomyLookup.from_arrays(
+            header['strings'], arrays['product_ids'], arrays['domain_ids'],
+            arrays['segment_ids'], arrays['topic_ids'], arrays['group_ids']
+        )
+        self.arrays = arrays
+
+    def ngram_index(self) -> NGramIndex:
+        """Fresh NGramIndex over topic_choices, its arrays read from the artifact."""
+        ngram = self.header['ngram']
+        char_counts = self.arrays['char_counts'].reshape(
+            len(ngram['alphabet']), len(self.topic_choices)
+        )
+        return NGramIndex.from_arrays(
+            self.topic_choices, ngram['n'], ngram['alphabet'], char_counts, ngram['grams'],
+            self.arrays['posting_offsets'], self.arrays['posting_columns'],
+            self.arrays['posting_counts']
+        )
+
+
+def write_artifact(path: str, lookup: TaxonomyLookup, topic_choices: List[str],
+                   topic_index: np.ndarray, topic_columns: List[str], ngram_index: NGramIndex,
+                   taxonomy_digest: str, synonyms_digest: str):
+    """
+    Write a compiled taxonomy.
+
+    The file is written next to the final path and renamed into place, so a
+    running matcher never maps a half-written artifact.
+
+    Args:
+        path: Artifact path (see artifact_file())
+        lookup: TaxonomyLookup built from the workbook
+        topic_choices: Unique lowercased topics (score matrix columns)
+        topic_index: Score matrix column of every lookup entry
+        topic_columns: Topic columns detected in the workbook
+        ngram_index: NGramIndex built over topic_choices
+        taxonomy_digest: file_digest() of the taxonomy workbook
+        synonyms_digest: file_digest() of the synonyms JSON
+    """
+    grams, posting_offsets, posting_columns, posting_counts = ngram_index.posting_arrays()
+    arrays = {
+        'product_ids': lookup.product_ids,
+        'domain_ids': lookup.domain_ids,
+        'segment_ids': lookup.segment_ids,
+        'topic_ids': lookup.topic_ids,
+        'group_ids': lookup.group_ids,
+        'topic_index': topic_index,
+        'char_counts': ngram_index.char_counts.ravel(),
+        'posting_offsets': posting_offsets,
+        'posting_columns': posting_columns,
+        'posting_counts': posting_counts
+    }
+
+    header = {
+        'version': ARTIFACT_VERSION,
+        'taxonomy_digest': taxonomy_digest,
+        'synonyms_digest': synonyms_digest,
+        'entries': len(lookup),
+        'topic_columns': list(topic_columns),
+        'strings': lookup.strings,
+        'topic_choices': list(topic_choices),
+        'ngram': {'n': ngram_index.n, 'alphabet': list(ngram_index.alphabet), 'grams': grams},
+        'arrays': {}
+    }
+
+    # Array offsets are relative to the end of the aligned header
+    offset = 0
+    for name, dtype in _ARRAYS.items():
+        size = len(arrays[name]) * np.dtype(dtype).itemsize
+        header['arrays'][name] = {'dtype': dtype, 'offset': offset, 'length': len(arrays[name])}
+        offset += -(-size // _ALIGNMENT) * _ALIGNMENT
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    data_start = -(-(_PREFIX.size + len(header_bytes)) // _ALIGNMENT) * _ALIGNMENT
+
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(_PREFIX.pack(_MAGIC, len(header_bytes)))
+        f.write(header_bytes)
+        for name, dtype in _ARRAYS.items():
+            f.write(b'\0' * (data_start + header['arrays'][name]['offset'] - f.tell()))
+            f.write(np.ascontiguousarray(arrays[name], dtype=dtype).tobytes())
+    os.replace(temp_path, path)
+
+
+def read_header(path: str) -> Optional[dict]:
+    """
+    Read an artifact header without mapping its arrays.
+
+    Args:
+        path: Artifact path
+
+    Returns:
+        Header dict (with 'data_start' added), or None if the file is
+        missing, not an artifact or from another version
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            return None
+        magic, header_length = _PREFIX.unpack(prefix)
+        if magic != _MAGIC:
+            return None
+        header = json.loads(f.read(header_length).decode('utf-8'))
+    if header.get('version') != ARTIFACT_VERSION:
+        return None
+    header['data_start'] = -(-(_PREFIX.size + header_length) // _ALIGNMENT) * _ALIGNMENT
+    return header
+
+
+def load_artifact(path: str, taxonomy_digest: str,
+                  synonyms_digest: str) -> Optional[TaxonomyArtifact]:
+    """
+    Load a compiled taxonomy if it was compiled from the current sources.
+
+    Args:
+        path: Artifact path
+        taxonomy_digest: file_digest() of the current taxonomy workbook
+        synonyms_digest: file_digest() of the current synonyms JSON
+
+    Returns:
+        TaxonomyArtifact with memory-mapped arrays, or None if the artifact
+        is missing, from another version or stale
+    """
+    header = read_header(path)
+    if header is None:
+        return None
+    if header['taxonomy_digest'] != taxonomy_digest or header['synonyms_digest'] != synonyms_digest:
+        return None
+
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        if spec['length'] == 0:
+            arrays[name] = np.zeros(0, dtype=spec['dtype'])
+            continue
+        arrays[name] = np.memmap(path, dtype=spec['dtype'], mode='r',
+                                 offset=header['data_start'] + spec['offset'],
+                                 shape=(spec['length'],))
+    return TaxonomyArtifact(header, arrays)
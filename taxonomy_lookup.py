@@ -0,0 +1,159 @@
+"""
+Taxonomy Lookup for NL Taxonomy Mapper V3
+Flat topic entries stored as interned strings and parallel integer arrays
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence, Tuple
+
+from lazy_import import lazy_import
+
+np = lazy_import('numpy')
+
+
+class TaxonomyLookup:
+    """
+    One entry per (product, domain, segment, topic) cell of the taxonomy.
+
+    Every distinct string is stored once in `strings`; entries are rows of
+    parallel integer arrays indexing into it. Matching works on entry
+    indices and strings are only materialized for output rows.
+    """
+
+    def __init__(self, products: Sequence[str], domains: Sequence[str],
+                 segments: Sequence[str], topics: Sequence[str]):
+        """
+        Intern the entry strings and build the id arrays.
+
+        Args:
+            products: Product of every entry
+            domains: Domain of every entry
+            segments: Segment of every entry
+            topics: Topic of every entry
+        """
+        self.strings = ['']
+        self.string_ids = {'': 0}
+
+        self.product_ids = self._intern_all(products)
+        self.domain_ids = self._intern_all(domains)
+        self.segment_ids = self._intern_all(segments)
+        self.topic_ids = self._intern_all(topics)
+
+        # Group id per distinct (product, domain, segment) row
+        groups = {}
+        self.group_ids = np.fromiter(
+            (groups.setdefault(key, len(groups))
+             for key in zip(self.product_ids.tolist(), self.domain_ids.tolist(),
+                            self.segment_ids.tolist())),
+            dtype=np.int64, count=len(self.topic_ids)
+        )
+        self._build_codes()
+
+    @classmethod
+    def from_arrays(cls, strings: List[str], product_ids: np.ndarray,
+                    domain_ids: np.ndarray, segment_ids: np.ndarray,
+                    topic_ids: np.ndarray, group_ids: np.ndarray) -> TaxonomyLookup:
+        """
+        Rebuild a lookup from its saved strings and id arrays.
+
+        Args:
+            strings: Interned strings (index 0 is the empty string)
+            product_ids: Product string id of every entry
+            domain_ids: Domain string id of every entry
+            segment_ids: Segment string id of every entry
+            topic_ids: Topic string id of every entry
+            group_ids: (product, domain, segment) group id of every entry
+
+        Returns:
+            TaxonomyLookup equal to the one the arrays were saved from
+        """
+        lookup = cls.__new__(cls)
+        lookup.strings = list(strings)
+        lookup.string_ids = {value: i for i, value in enumerate(lookup.strings)}
+        lookup.product_ids = product_ids
+        lookup.domain_ids = domain_ids
+        lookup.segment_ids = segment_ids
+        lookup.topic_ids = topic_ids
+        lookup.group_ids = group_ids
+        lookup._build_codes()
+        return lookup
+
+    def _build_codes(self):
+        """
+        Deduplication keys: (group, topic) for the entry itself and
+        (group, segment) for the auto-added segment-as-topic row.
+        """
+        n = len(self.strings)
+        group_ids = np.asarray(self.group_ids, dtype=np.int64)
+        self.topic_codes = (group_ids * n + self.topic_ids).tolist()
+        self.segment_codes = (group_ids * n + self.segment_ids).tolist()
+
+    def _intern_all(self, values: Sequence[str]) -> np.ndarray:
+        """Intern values and return their ids as an int32 array."""
+        string_ids = self.string_ids
+        strings = self.strings
+        ids = np.empty(len(values), dtype=np.int32)
+        for i, value in enumerate(values):
+            string_id = string_ids.get(value)
+            if string_id is None:
+                string_id = string_ids[value] = len(strings)
+                strings.append(value)
+            ids[i] = string_id
+        return ids
+
+    def __len__(self) -> int:
+        return len(self.topic_ids)
+
+    def row(self, entry: int) -> Tuple[str, str, str, str]:
+        """
+        Materialize one entry.
+
+        Args:
+            entry: Entry index
+
+        Returns:
+            (product, domain, segment, topic)
+        """
+        strings = self.strings
+        return (strings[self.product_ids[entry]], strings[self.domain_ids[entry]],
+                strings[self.segment_ids[entry]], strings[self.topic_ids[entry]])
+
+    def topics(self) -> List[str]:
+        """Topic string of every entry, in entry order."""
+        strings = self.strings
+        return [strings[topic_id] for topic_id in self.topic_ids.tolist()]
+
+    def max_group_topics(self) -> int:
+        """
+        Most distinct topics one (product, domain, segment) group can emit.
+
+        Topics equal to the segment are not counted; consolidated output
+        drops them.
+
+        Returns:
+            Upper bound on the Topic_i columns of one consolidated row
+        """
+        pairs = {(group, topic) for group, topic, segment
+                 in zip(self.group_ids.tolist(), self.topic_ids.tolist(), self.segment_ids.tolist())
+                 if topic != segment}
+        counts = {}
+        for group, _ in pairs:
+            counts[group] = counts.get(group, 0) + 1
+        return max(counts.values(), default=0)
+
+    def code_table(self) -> Dict[Tuple[str, str, str, str], int]:
+        """
+        Deduplication key of every (product, domain, segment, topic) combination.
+
+        Includes the segment-as-topic combinations added for matched segments.
+
+        Returns:
+            Dict of (product, domain, segment, topic) -> integer key
+        """
+        table = {}
+        for entry in range(len(self)):
+            product, domain, segment, topic = self.row(entry)
+            table[(product, domain, segment, topic)] = self.topic_codes[entry]
+            table[(product, domain, segment, segment)] = self.segment_codes[entry]
+        return table
@@ -4,12 +4,45 @@ Matches URLs from semantic carriers to taxonomy topics using fuzzy string matchi
 NOW WITH MULTI-COUNTRY SUPPORT!
 """
 
-import pandas as pd
-from fuzzywuzzy import fuzz
+from __future__ import annotations
+
 from typing import List, Dict, Tuple, Optional
 import os
 import argparse
+import heapq
+import json
+import multiprocessing
+import signal
+import threading
+import time
+from async_matching import (DEFAULT_BATCH_SIZE, DEFAULT_MAX_PENDING, create_process_executor,
+                            match_many, record_fields)
+from consolidation import ConsolidatingSink, consolidate_topics, consolidated_columns, topic_columns
 from country_config import CountryConfig
+from carrier_io import (SUPPORTED_FORMATS, count_rows, detect_format, iter_dataframe_chunks,
+                        iter_semantic_chunks)
+from incremental import load_manifest, load_previous_rows, manifest_file, row_hash, write_manifest
+from lazy_import import lazy_import
+from output_sink import OUTPUT_COLUMNS, OutputSink, detect_sink_format, open_sink
+from parallel_matching import init_worker, score_in_pool
+from progress import CancellationToken, MatchCancelled, ProgressTracker, format_progress
+from run_stats import RunStats, timed_stage
+from scoring import NGramIndex, cdist
+from score_cache import ScoreCache, compute_fingerprint, data_digest, file_digest
+from synonym_matcher import SynonymMatcher
+from taxonomy_artifact import artifact_file, load_artifact, read_header, write_artifact
+from taxonomy_lookup import TaxonomyLookup
+
+# pandas and numpy are only imported once a run loads data, so --help,
+# --validate-config and --dry-run start quickly
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Keyword results kept before the match cache is cleared (see trim_scores)
+MAX_CACHED_KEYWORDS = 100000
+
+# Score matrix size before scored variations are cleared (see trim_scores)
+MAX_SCORE_MATRIX_BYTES = 64 * 1024 * 1024
 
 
 class TaxonomyMatcher:
@@ -22,6 +55,16 @@ class TaxonomyMatcher:
                  output_file: Optional[str] = None,
                  similarity_threshold: Optional[int] = None,
                  consolidate_topics: Optional[bool] = None,
+                 use_score_cache: Optional[bool] = None,
+                 workers: Optional[int] = None,
+                 write_stats: Optional[bool] = None,
+                 chunk_size: Optional[int] = None,
+                 semantic_format: Optional[str] = None,
+                 stream_output: Optional[bool] = None,
+                 incremental: Optional[bool] = None,
+                 previous_output: Optional[str] = None,
+                 top_k_per_keyword: Optional[int] = None,
+                 max_matches_per_url: Optional[int] = None,
                  config_file: str = 'config.yaml'):
         """
         Initialize the TaxonomyMatcher.
@@ -33,6 +76,17 @@ class TaxonomyMatcher:
             output_file: Path for output file (auto-generated if None)
             similarity_threshold: Minimum similarity score (overrides config)
             consolidate_topics: Consolidate topics into columns (overrides config)
+            use_score_cache: Persist raw scores between runs (overrides config)
+            workers: Number of matching processes (overrides config)
+            write_stats: Write a .stats.json sidecar next to the output (overrides config)
+            chunk_size: URLs matched per chunk when streaming input (overrides config)
+            semantic_format: Semantic carriers format: excel, csv, parquet or jsonl (overrides config)
+            stream_output: Write output rows chunk by chunk instead of all at the end (overrides config)
+            incremental: Rematch only URLs whose row changed since the previous run (overrides config)
+            previous_output: Output of the previous run for incremental mode (default: output_file)
+            top_k_per_keyword: Keep only the K best-scoring topics per keyword, 0 = all (overrides config)
+            max_matches_per_url: Keep the best matches within N output rows per URL, segment
+                                 rows included, 0 = all (overrides config)
             config_file: Path to YAML configuration file
         """
         # Load country configuration
@@ -57,11 +111,14 @@ class TaxonomyMatcher:
 
             if semantic_file is None:
                 semantic_file = country_files['semantic_carriers']
+                if semantic_format is None:
+                    semantic_format = self.country_config.get_semantic_format(self.country_code)
             if taxonomy_file is None:
                 taxonomy_file = country_files['taxonomy']
 
         self.semantic_file = semantic_file
         self.taxonomy_file = taxonomy_file
+        self.semantic_format = detect_format(semantic_file, semantic_format)
 
         # Generate output filename with country code suffix
         if output_file is None:
@@ -86,50 +143,322 @@ class TaxonomyMatcher:
             consolidate_topics = country_settings.get('consolidate_topics', False)
         self.consolidate_topics = consolidate_topics
 
+        # Use provided use_score_cache or config default
+        if use_score_cache is None:
+            use_score_cache = country_settings.get('score_cache', True)
+        self.use_score_cache = use_score_cache
+        self.score_cache_file = str(
+            self.country_config.config_file.parent /
+            country_settings.get('score_cache_file', 'score_cache.sqlite')
+        )
+        self.score_cache = None
+        self.score_cache_loaded = 0
+
+        # Use provided workers or config default (1 = match in this process)
+        if workers is None:
+            workers = country_settings.get('workers', 1)
+        self.workers = max(1, int(workers))
+
+        # Use provided write_stats or config default
+        if write_stats is None:
+            write_stats = country_settings.get('write_stats', False)
+        self.write_stats = write_stats
+        self.stats = RunStats()
+
+        # Use provided chunk_size or config default
+        if chunk_size is None:
+            chunk_size = country_settings.get('chunk_size', 10000)
+        self.chunk_size = max(1, int(chunk_size))
+
+        # Use provided stream_output or config default
+        if stream_output is None:
+            stream_output = country_settings.get('stream_output', False)
+        self.stream_output = stream_output
+        if stream_output:
+            detect_sink_format(self.output_file)
+
+        # Use provided incremental or config default
+        if incremental is None:
+            incremental = country_settings.get('incremental', False)
+        self.incremental = incremental
+        self.previous_output = previous_output or self.output_file
+        self.row_hashes = {}  # URL -> input row hash, written to the manifest
+
+        # Use provided match limits or config default (0 = unlimited)
+        if top_k_per_keyword is None:
+            top_k_per_keyword = country_settings.get('top_k_per_keyword', 0)
+        self.top_k_per_keyword = max(0, int(top_k_per_keyword or 0))
+        if max_matches_per_url is None:
+            max_matches_per_url = country_settings.get('max_matches_per_url', 0)
+        self.max_matches_per_url = max(0, int(max_matches_per_url or 0))
+
         # Load synonyms from JSON file instead of hardcoded dict
+        self.synonyms_file = self.country_config.get_country_files(self.country_code)['synonyms']
         self.synonyms = self.country_config.load_synonyms(self.country_code)
+        self.synonym_matcher = SynonymMatcher(self.synonyms)
+        self.synonyms_digest = None  # Set when synonyms are replaced in memory
 
         self.semantic_df = None
         self.taxonomy_df = None
-        self.taxonomy_lookup = []
+        # Data passed in memory (set_semantic_data/set_taxonomy_data) is not reloaded from disk
+        self.semantic_in_memory = False
+        self.taxonomy_in_memory = False
+        self.taxonomy_digest = None
+        self.taxonomy_lookup = TaxonomyLookup([], [], [], [])
+
+        # Use the compiled taxonomy (see compile_taxonomy) when it matches the workbook
+        self.use_compiled_taxonomy = country_settings.get('compiled_taxonomy', True)
+        self.taxonomy_artifact = None
+
+        # Batch scoring state: unique lowercased topics (columns) and scored variations (rows)
+        self.topic_choices = []
+        self.topic_index = np.zeros(0, dtype=np.intp)
+        self.variation_rows = {}
+        self.score_matrix = np.zeros((0, 0), dtype=np.int16)
+        self.score_cutoff = self.similarity_threshold
+        self.ngram_index = None
+
+        # Run-scoped keyword match cache: (normalized keyword, threshold) -> (entries, scores)
+        self.match_cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # Counts from the most recent process_matching() call
+        self.match_summary = {}
+
+        # Progress reports every progress_update_interval URLs; progress_callback
+        # receives a ProgressReport (default: print it). Setting cancel_token
+        # stops matching between URL batches and keeps the rows matched so far.
+        self.progress_interval = country_settings.get('progress_update_interval', 50)
+        self.progress_callback = None
+        self.cancel_token = CancellationToken()
+        self.cancelled = False
+
+        # Serializes matching when called from executor threads (see match_many)
+        self.lock = threading.Lock()
         
+    def __getstate__(self):
+        """Drop per-process resources when the matcher is sent to worker processes."""
+        state = self.__dict__.copy()
+        state['semantic_df'] = None
+        state['taxonomy_df'] = None
+        state['taxonomy_artifact'] = None
+        state['score_cache'] = None
+        state['progress_callback'] = None
+        state['cancel_token'] = None
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        """Restore a matcher received by a worker process."""
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    @timed_stage('load')
     def load_data(self):
-        """Load Excel files into pandas DataFrames."""
-        print(f"Loading {self.semantic_file}...")
-        self.semantic_df = pd.read_excel(self.semantic_file)
-        print(f"  Loaded {len(self.semantic_df)} URLs")
+        """
+        Load the taxonomy and, for Excel input, the semantic carriers.
+
+        CSV, Parquet and JSONL semantic carriers are not loaded here; they
+        are streamed in chunks by process_matching().
+        """
+        if self.semantic_in_memory:
+            print(f"Using {len(self.semantic_df)} URLs provided in memory")
+        elif self.semantic_format == 'excel':
+            print(f"Loading {self.semantic_file}...")
+            self.semantic_df = pd.read_excel(self.semantic_file)
+            print(f"  Loaded {len(self.semantic_df)} URLs")
+        else:
+            self.semantic_df = None
+            print(f"Streaming {self.semantic_file} ({self.semantic_format}) "
+                  f"in chunks of {self.chunk_size} URLs")
         
-        print(f"\nLoading {self.taxonomy_file}...")
+        print()
+        self.load_taxonomy()
+
+    def load_taxonomy(self):
+        """
+        Load the taxonomy (enough for matching keyword lists directly).
+
+        A fresh compiled taxonomy is memory-mapped instead of reading the
+        Excel file; a missing or stale one falls back to the workbook.
+        """
+        if self.taxonomy_in_memory:
+            print(f"Using {len(self.taxonomy_df)} taxonomy entries provided in memory")
+            return
+
+        self.taxonomy_artifact = None
+        if self.use_compiled_taxonomy:
+            compiled_file = artifact_file(self.taxonomy_file)
+            self.taxonomy_artifact = load_artifact(compiled_file, file_digest(self.taxonomy_file),
+                                                   file_digest(self.synonyms_file))
+            if self.taxonomy_artifact is not None:
+                print(f"Loading compiled taxonomy {compiled_file}...")
+                self.taxonomy_df = None
+                print(f"  Loaded {len(self.taxonomy_artifact.lookup)} topic entries")
+                return
+            if os.path.exists(compiled_file):
+                print(f"Note: {compiled_file} is out of date, reading the workbook "
+                      f"(run --compile-taxonomy to refresh it)")
+
+        print(f"Loading {self.taxonomy_file}...")
         self.taxonomy_df = pd.read_excel(self.taxonomy_file)
         print(f"  Loaded {len(self.taxonomy_df)} taxonomy entries")
-        
+
+    def taxonomy_entries(self) -> Tuple[TaxonomyLookup, List[str], np.ndarray, List[str]]:
+        """
+        Melt taxonomy_df into lookup entries and score matrix columns.
+
+        Returns:
+            (lookup, topic_choices, topic_index, topic_columns)
+        """
+        # Dynamically detect Topic columns
+        topic_columns = [col for col in self.taxonomy_df.columns if col.startswith('Topic')]
+
+        products = self.column_values(self.taxonomy_df, 'Product', fill='')
+        domains = self.column_values(self.taxonomy_df, 'Domain', fill='')
+        segments = self.column_values(self.taxonomy_df, 'Segment', fill='')
+
+        # Melt Topic columns to long format: one (row, topic) pair per non-empty cell
+        topic_values = self.taxonomy_df[topic_columns].to_numpy(dtype=object)
+        rows, cols = np.nonzero(pd.notna(topic_values))  # Row-major order
+        entry_rows = []
+        entry_topics = []
+        for r, topic in zip(rows.tolist(), topic_values[rows, cols]):
+            topic = str(topic).strip()
+            if topic:
+                entry_rows.append(r)
+                entry_topics.append(topic)
+
+        lookup = TaxonomyLookup(
+            [products[r] for r in entry_rows],
+            [domains[r] for r in entry_rows],
+            [segments[r] for r in entry_rows],
+            entry_topics
+        )
+
+        # Map every lookup entry to its column in the score matrix
+        choice_columns = {}
+        for topic in entry_topics:
+            choice_columns.setdefault(topic.lower(), len(choice_columns))
+        topic_index = np.array(
+            [choice_columns[topic.lower()] for topic in entry_topics], dtype=np.intp
+        )
+        return lookup, list(choice_columns), topic_index, topic_columns
+
+    @timed_stage('lookup')
     def build_taxonomy_lookup(self):
         """Build a flat lookup structure from taxonomy with all topics."""
         print("\nBuilding taxonomy lookup...")
-        
-        # Dynamically detect Topic columns
-        topic_columns = [col for col in self.taxonomy_df.columns if col.startswith('Topic')]
+
+        if self.taxonomy_artifact is not None:
+            artifact = self.taxonomy_artifact
+            self.taxonomy_lookup = artifact.lookup
+            self.topic_choices = artifact.topic_choices
+            self.topic_index = artifact.topic_index
+            topic_columns = artifact.topic_columns
+            self.ngram_index = artifact.ngram_index()
+        else:
+            (self.taxonomy_lookup, self.topic_choices,
+             self.topic_index, topic_columns) = self.taxonomy_entries()
         print(f"  Detected {len(topic_columns)} topic columns: {topic_columns}")
-        
-        for idx, row in self.taxonomy_df.iterrows():
-            product = row.get('Product', '')
-            domain = row.get('Domain', '')
-            segment = row.get('Segment', '')
-            
-            # Extract all topics from this row
-            for topic_col in topic_columns:
-                topic = row.get(topic_col, '')
-                if pd.notna(topic) and topic.strip():
-                    self.taxonomy_lookup.append({
-                        'product': product if pd.notna(product) else '',
-                        'domain': domain if pd.notna(domain) else '',
-                        'segment': segment if pd.notna(segment) else '',
-                        'topic': topic.strip()
-                    })
-        
+
+        self.clear_scores()
+        # Scores below the threshold active at build time are dropped from the matrix
+        self.score_cutoff = self.similarity_threshold
+        if self.taxonomy_artifact is None:
+            self.ngram_index = NGramIndex(self.topic_choices)
+
+        if self.use_score_cache:
+            self.open_score_cache()
+
         print(f"  Created {len(self.taxonomy_lookup)} searchable topic entries")
         print(f"  Note: Segments will be auto-added as topics when any topic from their row matches")
-        
+
+    def compile_taxonomy(self) -> str:
+        """
+        Compile the taxonomy workbook and synonyms into a binary artifact.
+
+        Later runs memory-map the artifact, including the n-gram index, instead
+        of parsing the workbook and re-indexing the topics, as long as neither
+        source file has changed since.
+
+        Returns:
+            Path of the written artifact
+        """
+        compiled_file = artifact_file(self.taxonomy_file)
+        print(f"Compiling {self.taxonomy_file}...")
+        self.taxonomy_df = pd.read_excel(self.taxonomy_file)
+        lookup, topic_choices, topic_index, topic_columns = self.taxonomy_entries()
+        write_artifact(compiled_file, lookup, topic_choices, topic_index, topic_columns,
+                       NGramIndex(topic_choices), file_digest(self.taxonomy_file), file_digest(self.synonyms_file))
+        print(f"  {len(lookup)} topic entries, {len(topic_choices)} unique topics, "
+              f"{len(lookup.strings)} distinct strings")
+        print(f"  Saved to: {compiled_file}")
+        return compiled_file
+
+    def set_synonyms(self, synonyms: Dict[str, List[str]]):
+        """
+        Replace the synonym dictionary loaded from the country config.
+
+        Args:
+            synonyms: Synonym mapping in the same format as synonyms.json
+        """
+        self.synonyms = synonyms
+        self.synonym_matcher = SynonymMatcher(synonyms)
+        self.synonyms_digest = data_digest(
+            json.dumps(synonyms, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        )
+
+    def set_taxonomy_data(self, taxonomy):
+        """
+        Use taxonomy rows from memory instead of taxonomy_file.
+
+        Call build_taxonomy_lookup() (or run_in_memory()) afterwards.
+
+        Args:
+            taxonomy: DataFrame or iterable of dicts with Product, Domain,
+                      Segment and Topic 1..N columns
+        """
+        if not isinstance(taxonomy, pd.DataFrame):
+            taxonomy = pd.DataFrame(list(taxonomy))
+        self.taxonomy_df = taxonomy
+        self.taxonomy_in_memory = True
+        self.taxonomy_artifact = None
+        self.ngram_index = None  # Lookup has to be rebuilt
+
+        hashed = pd.util.hash_pandas_object(taxonomy.astype(str), index=False)
+        self.taxonomy_digest = data_digest(
+            '\x1f'.join(map(str, taxonomy.columns)).encode('utf-8') + hashed.to_numpy().tobytes()
+        )
+
+    def set_semantic_data(self, carriers):
+        """
+        Use semantic carriers from memory instead of semantic_file.
+
+        Args:
+            carriers: DataFrame with URL and Keyword 1..10 columns, or an
+                      iterable of such row dicts, (url, keywords) pairs or
+                      dicts with 'url' and 'keywords'
+
+        Raises:
+            ValueError: If a record has more than 10 keywords
+        """
+        if not isinstance(carriers, pd.DataFrame):
+            rows = []
+            for record in carriers:
+                if isinstance(record, dict) and 'keywords' not in record:
+                    rows.append(record)
+                    continue
+                url, keywords = record_fields(record)
+                if len(keywords) > 10:
+                    raise ValueError(f"{url}: at most 10 keywords per URL (got {len(keywords)})")
+                rows.append({'URL': url, **{f'Keyword {i}': keyword
+                                            for i, keyword in enumerate(keywords, start=1)}})
+            carriers = pd.DataFrame(rows)
+        self.semantic_df = carriers
+        self.semantic_in_memory = True
+
     def expand_with_synonyms(self, keyword: str) -> List[str]:
         """
         Expand a keyword with its synonyms.
@@ -140,16 +469,200 @@ class TaxonomyMatcher:
         Returns:
             List of keyword variations including synonyms
         """
-        variations = [keyword.lower().strip()]
-        
-        # Check if keyword matches any synonym key
-        for key, synonyms in self.synonyms.items():
-            if key in keyword.lower():
-                variations.extend(synonyms)
-        
-        return list(set(variations))
+        return self.synonym_matcher.expand(keyword)
     
-    def find_topic_matches(self, keyword: str) -> List[Dict]:
+    def open_score_cache(self):
+        """Open the persistent score cache for the current taxonomy and synonyms."""
+        if self.score_cache is not None:
+            self.score_cache.close()
+        fingerprint = self.data_fingerprint()
+        self.score_cache = ScoreCache(self.score_cache_file, self.country_code, fingerprint)
+        self.score_cache_loaded = 0
+
+    def data_fingerprint(self) -> str:
+        """Fingerprint of the taxonomy, synonyms and scorer, from files or in-memory data."""
+        return compute_fingerprint(self.taxonomy_file, self.synonyms_file,
+                                   self.taxonomy_digest, self.synonyms_digest)
+
+    def incremental_fingerprint(self) -> str:
+        """
+        Fingerprint of everything besides the input rows that affects the output.
+
+        Returns:
+            Taxonomy/synonyms/scorer fingerprint extended with threshold and layout
+        """
+        fingerprint = self.data_fingerprint()
+        fingerprint = f'{fingerprint}:{self.similarity_threshold}:{int(bool(self.consolidate_topics))}'
+        if self.top_k_per_keyword or self.max_matches_per_url:
+            # Only added with limits, so manifests of unlimited runs stay valid
+            fingerprint += f':{self.top_k_per_keyword}:{self.max_matches_per_url}'
+        return fingerprint
+
+    def load_previous_results(self) -> Optional[Dict[str, Tuple[str, List[tuple]]]]:
+        """
+        Load the previous output and manifest for incremental matching.
+
+        Returns:
+            Dict of URL -> (row hash, previous output rows), or None when
+            every URL has to be rematched
+        """
+        manifest = load_manifest(manifest_file(self.previous_output))
+        if manifest is None or not os.path.exists(self.previous_output):
+            print(f"  No previous output/manifest for {self.previous_output}: matching all URLs")
+            return None
+        if manifest['fingerprint'] != self.incremental_fingerprint():
+            print("  Taxonomy, synonyms, threshold or layout changed: matching all URLs")
+            return None
+
+        print(f"Loading previous output {self.previous_output}...")
+        rows_by_url = load_previous_rows(self.previous_output)
+        previous = {
+            url: (digest, rows_by_url[url])
+            for url, digest in manifest['rows'].items()
+            if digest is not None and url in rows_by_url
+        }
+        print(f"  {len(previous)} URLs can be reused if unchanged")
+        return previous
+
+    def save_manifest(self):
+        """Write the row-hash manifest next to the output for the next incremental run."""
+        write_manifest(manifest_file(self.output_file), self.incremental_fingerprint(),
+                       self.row_hashes)
+        print(f"Manifest saved to: {manifest_file(self.output_file)}")
+
+    def close_score_cache(self):
+        """Close the persistent score cache (scores stay on disk)."""
+        if self.score_cache is not None:
+            self.score_cache.close()
+            self.score_cache = None
+
+    def check_cancelled(self):
+        """
+        Raises:
+            MatchCancelled: If the cancel token has been cancelled
+        """
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+
+    def report_progress(self, report):
+        """Send a ProgressReport to progress_callback, or print it."""
+        if self.progress_callback is not None:
+            self.progress_callback(report)
+        else:
+            print(f"  {format_progress(report)}")
+
+    def count_urls(self) -> Optional[int]:
+        """Number of URL rows to match, if known without reading the input."""
+        if self.semantic_df is not None:
+            return len(self.semantic_df)
+        return count_rows(self.semantic_file, self.semantic_format)
+
+    def compute_scores(self, variations: List[str]) -> np.ndarray:
+        """
+        Score variations against all topics at score_cutoff, counting the work in stats.
+
+        Only topics whose character histogram and n-gram overlap could reach
+        the cut-off are scored; the cancel token is checked before every
+        variation, so a cancellation does not wait for a whole chunk.
+
+        Args:
+            variations: Unique keyword variations
+
+        Returns:
+            int16 score matrix (variations x topics)
+        """
+        pairs_before = self.ngram_index.pairs_scored if self.ngram_index else 0
+        bounded_before = self.ngram_index.pairs_bounded if self.ngram_index else 0
+        scores = cdist(variations, self.topic_choices, score_cutoff=self.score_cutoff,
+                       index=self.ngram_index, check=self.check_cancelled)
+        pairs = len(variations) * len(self.topic_choices)
+        if self.ngram_index and self.score_cutoff > 0:
+            comparisons = self.ngram_index.pairs_scored - pairs_before
+        else:
+            comparisons = pairs
+        self.stats.count('fuzzy_comparisons', comparisons)
+        self.stats.count('pairs_pruned', pairs - comparisons)
+        if self.ngram_index:
+            self.stats.count('pairs_pruned_bound', self.ngram_index.pairs_bounded - bounded_before)
+        return scores
+
+    def score_variations(self, variations, pool=None) -> None:
+        """
+        Score keyword variations against all taxonomy topics in one batch.
+
+        Variations that were already scored are skipped; new ones are appended
+        as rows to the score matrix. When the persistent score cache is open,
+        cached rows computed at the same or a lower cut-off are reused and
+        freshly scored rows are written back.
+
+        Args:
+            variations: Iterable of keyword variations
+            pool: Optional process pool from create_pool() to split the scoring across
+        """
+        new_variations = [v for v in dict.fromkeys(variations) if v not in self.variation_rows]
+        if not new_variations:
+            return
+
+        cached = (self.score_cache.load(new_variations, self.score_cutoff)
+                  if self.score_cache else {})
+        missing = [v for v in new_variations if v not in cached]
+
+        if pool is not None and len(missing) > 1:
+            scored = score_in_pool(pool, self.country_code, self, missing, self.workers,
+                                   self.cancel_token)
+        else:
+            scored = self.compute_scores(missing)
+        self.stats.count('score_cache_rows', len(cached))
+        self.stats.count('variations_scored', len(new_variations))
+        if self.score_cache and missing:
+            self.score_cache.store(zip(missing, scored), self.score_cutoff)
+        self.score_cache_loaded += len(cached)
+
+        scored_rows = dict(zip(missing, scored))
+        scores = np.array(
+            [cached[v] if v in cached else scored_rows[v] for v in new_variations],
+            dtype=np.int16
+        ).reshape(len(new_variations), len(self.topic_choices))
+        scores[scores < self.score_cutoff] = 0
+
+        for variation in new_variations:
+            self.variation_rows[variation] = len(self.variation_rows)
+        self.score_matrix = np.vstack([self.score_matrix, scores])
+
+    def score_keywords(self, keywords, pool=None) -> None:
+        """
+        Score the variations of many keywords in one batch (see score_variations).
+
+        Args:
+            keywords: Iterable of keywords (duplicates are scored once)
+            pool: Optional process pool from create_pool()
+        """
+        self.score_variations(
+            (variation for keyword in dict.fromkeys(keywords)
+             for variation in self.expand_with_synonyms(keyword)),
+            pool=pool
+        )
+
+    def clear_scores(self):
+        """Forget scored variations and keyword matches (the score cache keeps its rows)."""
+        self.variation_rows = {}
+        self.score_matrix = np.zeros((0, len(self.topic_choices)), dtype=np.int16)
+        self.match_cache = {}
+
+    def trim_scores(self):
+        """
+        Clear scores and keyword matches once they outgrow MAX_SCORE_MATRIX_BYTES
+        or MAX_CACHED_KEYWORDS, so memory stays flat over long runs.
+
+        Call between batches only, after their rows are matched. Variations
+        seen again are re-scored (or read back from the score cache).
+        """
+        if (len(self.match_cache) > MAX_CACHED_KEYWORDS
+                or self.score_matrix.nbytes > MAX_SCORE_MATRIX_BYTES):
+            self.clear_scores()
+            self.stats.count('score_evictions')
+
+    def find_topic_matches(self, keyword: str) -> List[int]:
         """
         Find matching topics for a given keyword.
         
@@ -157,30 +670,376 @@ class TaxonomyMatcher:
             keyword: Keyword to match
             
         Returns:
-            List of matching taxonomy entries with similarity scores
+            Indices of matching taxonomy_lookup entries, best score first
+        """
+        return self.score_topic_matches(keyword)[0]
+
+    def score_topic_matches(self, keyword: str) -> Tuple[List[int], List[int]]:
+        """
+        Find matching topics for a keyword, with their scores.
+
+        With top_k_per_keyword set, only the entries of the K best-scoring
+        topics are kept (ties go to the topic first in taxonomy order).
+
+        Args:
+            keyword: Keyword to match
+
+        Returns:
+            (taxonomy_lookup entry indices, their scores), best score first
         """
-        matches = []
         keyword_variations = self.expand_with_synonyms(keyword)
-        
-        for tax_entry in self.taxonomy_lookup:
-            topic = tax_entry['topic'].lower()
-            max_score = 0
-            
-            # Check similarity against all keyword variations
-            for variation in keyword_variations:
-                score = fuzz.partial_ratio(variation, topic)
-                max_score = max(max_score, score)
-            
-            if max_score >= self.similarity_threshold:
-                matches.append({
-                    **tax_entry,
-                    'similarity_score': max_score
-                })
-        
-        # Sort by similarity score (highest first)
-        matches.sort(key=lambda x: x['similarity_score'], reverse=True)
+        if len(keyword_variations) > 1:
+            self.stats.count('synonym_expansions')
+        self.score_variations(keyword_variations)
+
+        # Best score per topic across all keyword variations
+        rows = [self.variation_rows[variation] for variation in keyword_variations]
+        topic_scores = self.score_matrix[rows].max(axis=0, initial=0)
+        entry_scores = topic_scores[self.topic_index]
+
+        matched = np.flatnonzero(entry_scores >= self.similarity_threshold)
+
+        if self.top_k_per_keyword:
+            # Distinct matched topics in taxonomy order; a heap picks the K best
+            columns = dict.fromkeys(self.topic_index[matched].tolist())
+            if len(columns) > self.top_k_per_keyword:
+                best = heapq.nlargest(self.top_k_per_keyword, columns,
+                                      key=topic_scores.__getitem__)
+                kept = matched[np.isin(self.topic_index[matched], best)]
+                self.stats.count('matches_capped', len(matched) - len(kept))
+                matched = kept
+
+        # Sort by similarity score (highest first), keeping taxonomy order for ties
+        matched = matched[np.argsort(-entry_scores[matched], kind='stable')]
+
+        return matched.tolist(), entry_scores[matched].tolist()
+    
+    def get_topic_matches(self, keyword: str) -> List[int]:
+        """
+        Find matching topics for a keyword, reusing earlier results in this run.
+
+        Args:
+            keyword: Keyword to match
+
+        Returns:
+            Indices of matching taxonomy_lookup entries, best score first
+        """
+        return self.get_scored_matches(keyword)[0]
+
+    def get_scored_matches(self, keyword: str) -> Tuple[List[int], List[int]]:
+        """
+        Find matching topics and their scores, reusing earlier results in this run.
+
+        Args:
+            keyword: Keyword to match
+
+        Returns:
+            (taxonomy_lookup entry indices, their scores), best score first
+        """
+        cache_key = (keyword.lower().strip(), self.similarity_threshold)
+        matches = self.match_cache.get(cache_key)
+
+        if matches is None:
+            self.cache_misses += 1
+            matches = self.score_topic_matches(keyword)
+            self.match_cache[cache_key] = matches
+        else:
+            self.cache_hits += 1
+
         return matches
     
+    def match_url(self, keywords: List[str]) -> List[int]:
+        """
+        Collect the matches of all keywords of one URL, before deduplication.
+
+        Args:
+            keywords: Keywords of the URL
+
+        Returns:
+            taxonomy_lookup entry indices in match order (one per combination,
+            within max_matches_per_url output rows, when that is set)
+        """
+        if self.max_matches_per_url:
+            return self.best_url_matches(keywords)
+        return [
+            entry
+            for keyword in keywords
+            for entry in self.get_topic_matches(keyword)
+        ]
+
+    def best_url_matches(self, keywords: List[str]) -> List[int]:
+        """
+        Keep one URL's best matches within max_matches_per_url output rows.
+
+        Every (Product, Domain, Segment, Topic) combination counts once, at
+        its best score over the keywords; ties go to the earlier match.
+        Combinations are popped from a heap, best first, and kept while their
+        rows fit: a match costs its own row plus its auto-added segment row,
+        unless that row is already counted. The best match is always kept, so
+        a matched URL never becomes UNMAPPED.
+
+        Args:
+            keywords: Keywords of the URL
+
+        Returns:
+            taxonomy_lookup entry indices, one per kept combination, in match order
+        """
+        lookup = self.taxonomy_lookup
+        topic_codes = lookup.topic_codes
+        candidates = {}  # Combination -> [-best score, first position, entry]
+        for keyword in keywords:
+            entries, scores = self.get_scored_matches(keyword)
+            for entry, score in zip(entries, scores):
+                candidate = candidates.get(topic_codes[entry])
+                if candidate is None:
+                    candidates[topic_codes[entry]] = [-score, len(candidates), entry]
+                elif -score < candidate[0]:
+                    candidate[0] = -score
+
+        heap = list(candidates.values())
+        heapq.heapify(heap)
+        rows = set()  # Output row combinations of the kept matches
+        kept = []
+        while heap and len(rows) < self.max_matches_per_url:
+            _, position, entry = heapq.heappop(heap)
+            match_rows = {topic_codes[entry]}
+            if lookup.segment_ids[entry]:
+                match_rows.add(lookup.segment_codes[entry])
+            if kept and len(rows | match_rows) > self.max_matches_per_url:
+                continue
+            rows |= match_rows
+            kept.append((position, entry))
+
+        if len(kept) < len(candidates):
+            self.stats.count('matches_capped', len(candidates) - len(kept))
+        return [entry for _, entry in sorted(kept)]
+
+    def emit_url_rows(self, url: str, matches: List[int], seen_combinations: set,
+                      results: List[tuple]) -> Tuple[bool, int]:
+        """
+        Deduplicate one URL's matches and append its output rows.
+
+        Adds the segment-as-topic row for every matched segment, or a single
+        UNMAPPED row when nothing matched.
+
+        Args:
+            url: URL of the row
+            matches: taxonomy_lookup entry indices from match_url()
+            seen_combinations: Integer-coded combinations already emitted for this URL
+            results: Output rows to append (URL, Product, Domain, Segment, Topic) to
+
+        Returns:
+            (whether any topic matched, number of duplicate combinations skipped)
+        """
+        lookup = self.taxonomy_lookup
+        topic_codes = lookup.topic_codes
+        segment_codes = lookup.segment_codes
+        url_has_match = False
+        rejected = 0
+        matched_segments = {}  # Matched (Product, Domain, Segment) -> auto-add key
+
+        # Process each keyword's matches
+        for entry in matches:
+            # Integer key of the (Product, Domain, Segment, Topic) combination
+            combo_key = topic_codes[entry]
+
+            # Only add if not seen before (deduplication)
+            if combo_key not in seen_combinations:
+                seen_combinations.add(combo_key)
+                product, domain, segment, topic = lookup.row(entry)
+                results.append((url, product, domain, segment, topic))
+                url_has_match = True
+
+                # Track this segment combination for auto-addition
+                if segment:
+                    matched_segments.setdefault((product, domain, segment), segment_codes[entry])
+            else:
+                rejected += 1
+
+        # AUTO-ADD: For each matched segment, add a row where Segment = Topic
+        for (product, domain, segment), combo_key in matched_segments.items():
+            # Only add if this exact combination doesn't already exist
+            if combo_key not in seen_combinations:
+                seen_combinations.add(combo_key)
+                # Segment becomes the Topic
+                results.append((url, product, domain, segment, segment))
+            else:
+                rejected += 1
+
+        if not url_has_match:
+            # Add unmapped URL to results with empty taxonomy fields
+            results.append((url, '', 'UNMAPPED', '', ''))
+
+        return url_has_match, rejected
+
+    def match_keywords(self, url: str, keywords: List[str]) -> List[tuple]:
+        """
+        Match a single URL's keywords, outside of a process_matching() run.
+
+        Keyword results stay in match_cache, so repeated keywords are free.
+
+        Args:
+            url: URL to report in the rows
+            keywords: Keywords of the URL
+
+        Returns:
+            Output rows (URL, Product, Domain, Segment, Topic); one UNMAPPED row if nothing matched
+        """
+        keywords = [str(kw).strip() for kw in keywords if kw is not None]
+        results = []
+        self.emit_url_rows(url, self.match_url(keywords), set(), results)
+        return results
+
+    def match_many(self, records, executor=None, batch_size: int = DEFAULT_BATCH_SIZE,
+                   max_pending: int = DEFAULT_MAX_PENDING):
+        """
+        Match records from asyncio code, yielding results in input order.
+
+        Scoring runs in an executor so the event loop stays free:
+
+            async for rows in matcher.match_many(records):
+                ...
+
+        Args:
+            records: Iterable or async iterable of (url, keywords) pairs or
+                     dicts with 'url' and 'keywords'
+            executor: concurrent.futures executor; use create_process_executor()
+                      for processes (default: one worker thread)
+            batch_size: Records per executor task
+            max_pending: Batches in flight before reading more records
+
+        Returns:
+            Async iterator of output rows (URL, Product, Domain, Segment, Topic) per record
+        """
+        return match_many(self, records, executor, batch_size, max_pending)
+
+    def create_process_executor(self, workers: Optional[int] = None):
+        """
+        Start a process pool executor for match_many() with this matcher preloaded.
+
+        Args:
+            workers: Worker processes (default: self.workers)
+
+        Returns:
+            concurrent.futures.ProcessPoolExecutor
+        """
+        return create_process_executor(self, workers or self.workers)
+
+    def create_pool(self):
+        """
+        Start a process pool for matching.
+
+        Each worker receives this matcher (with its lookup, synonyms and n-gram
+        index) once at startup.
+
+        Returns:
+            multiprocessing Pool
+        """
+        return multiprocessing.Pool(self.workers, initializer=init_worker,
+                                    initargs=({self.country_code: self},))
+
+    def known_score_rows(self, variations) -> Dict[str, np.ndarray]:
+        """
+        Get score matrix rows for variations that are already scored.
+
+        Args:
+            variations: Iterable of keyword variations
+
+        Returns:
+            Dict of variation -> score row (unknown variations are left out)
+        """
+        return {
+            variation: self.score_matrix[self.variation_rows[variation]]
+            for variation in dict.fromkeys(variations) if variation in self.variation_rows
+        }
+
+    def add_score_rows(self, rows: Dict[str, np.ndarray]):
+        """
+        Add score rows computed elsewhere (e.g. by the parent process).
+
+        Args:
+            rows: Dict of variation -> score row at the current cut-off
+        """
+        new_rows = [(v, row) for v, row in rows.items() if v not in self.variation_rows]
+        if not new_rows:
+            return
+        for variation, _ in new_rows:
+            self.variation_rows[variation] = len(self.variation_rows)
+        self.score_matrix = np.vstack([self.score_matrix] + [row for _, row in new_rows])
+
+    def match_chunk(self, url_keywords: List[List[str]], pool=None) -> List[List[Tuple]]:
+        """
+        Match the keyword lists of one chunk of URLs.
+
+        Args:
+            url_keywords: Keyword list for every URL row of the chunk
+            pool: Optional process pool from create_pool()
+
+        Returns:
+            Per-row match tuples in row order
+        """
+        # Score every unique keyword variation against all topics up front
+        # (split across the pool's workers when there is one), then match rows
+        self.trim_scores()
+        self.score_keywords((kw for keywords in url_keywords for kw in keywords), pool=pool)
+        return [self.match_url(keywords) for keywords in url_keywords]
+
+    def iter_semantic_chunks(self):
+        """
+        Iterate over the semantic carriers in chunks of at most chunk_size rows.
+
+        Yields:
+            DataFrame chunks (slices of semantic_df when it is loaded, else streamed from disk)
+        """
+        if self.semantic_df is not None:
+            return iter_dataframe_chunks(self.semantic_df, self.chunk_size)
+        return iter_semantic_chunks(self.semantic_file, self.semantic_format, self.chunk_size)
+
+    @staticmethod
+    def column_values(df: pd.DataFrame, column: str, fill=None) -> np.ndarray:
+        """
+        Get a column as an object array, tolerating a missing column.
+
+        Args:
+            df: Source DataFrame
+            column: Column name
+            fill: Replacement for missing cells (None keeps NaN as-is)
+
+        Returns:
+            Object array with one value per row ('' if the column is missing)
+        """
+        if column not in df.columns:
+            return np.full(len(df), '', dtype=object)
+        # Copy: for object columns to_numpy() may return a (read-only) view of df
+        values = np.array(df[column].to_numpy(dtype=object), dtype=object, copy=True)
+        if fill is not None:
+            values[pd.isna(values)] = fill
+        return values
+
+    def extract_keyword_lists(self, df: pd.DataFrame) -> List[List[str]]:
+        """
+        Extract the keywords of every row without building per-row Series.
+
+        The Keyword 1..10 columns are melted into long-format (row, keyword)
+        arrays, then regrouped per row in column order.
+
+        Args:
+            df: Semantic carriers DataFrame
+
+        Returns:
+            Keyword list for every row
+        """
+        keyword_columns = [f'Keyword {i}' for i in range(1, 11) if f'Keyword {i}' in df.columns]
+        url_keywords = [[] for _ in range(len(df))]
+        if not keyword_columns:
+            return url_keywords
+
+        keyword_values = df[keyword_columns].to_numpy(dtype=object)
+        rows, cols = np.nonzero(pd.notna(keyword_values))  # Row-major order
+        for r, keyword in zip(rows.tolist(), keyword_values[rows, cols]):
+            url_keywords[r].append(str(keyword).strip())
+        return url_keywords
+
     def extract_keywords(self, row) -> List[str]:
         """
         Extract all keywords from a semantic carriers row.
@@ -198,94 +1057,169 @@ class TaxonomyMatcher:
                 keywords.append(str(row[col_name]).strip())
         return keywords
     
-    def process_matching(self) -> pd.DataFrame:
+    @timed_stage('matching')
+    def process_matching(self, sink: Optional[OutputSink] = None,
+                         previous: Optional[Dict[str, Tuple[str, List[tuple]]]] = None,
+                         pool=None) -> Optional[pd.DataFrame]:
         """
         Main processing: match all URLs to taxonomy topics.
-        
+
+        Args:
+            sink: Optional output sink; rows are then written after every chunk
+                  instead of being collected
+            previous: Previous results from load_previous_results(); URLs whose
+                      row hash is unchanged reuse their previous rows
+            pool: Shared process pool whose workers hold this matcher (default:
+                  a pool of self.workers processes for this call when workers > 1)
+
+        Matching stops early when cancel_token is cancelled; the URLs of the
+        batches finished before that are returned (or written) and
+        self.cancelled is set.
+
         Returns:
-            DataFrame with matched results (includes unmapped URLs)
+            DataFrame with matched results (includes unmapped URLs), or None
+            when the rows were written to sink
         """
         print("\nProcessing URL-to-taxonomy matching...")
+        self.cancelled = False
+        progress = ProgressTracker(self.report_progress, self.count_urls(), self.progress_interval)
         results = []
-        seen_combinations = set()  # For deduplication
+        output_rows = 0
+        # Deduplication state for the current URL only: every key contains the URL,
+        # so combinations never need to be remembered once the URL is done
+        current_url = None
+        seen_combinations = set()  # Integer-coded (Product, Domain, Segment, Topic)
+        self.match_cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
         
-        total_urls = len(self.semantic_df)
+        total_urls = 0
         urls_with_matches = 0
-        unmapped_urls = []
-        
-        for idx, row in self.semantic_df.iterrows():
-            url = row.get('URL', '')
-            keywords = self.extract_keywords(row)
-            
-            url_has_match = False
-            matched_segments = set()  # Track which (Product, Domain, Segment) combos matched
-            
-            # Process each keyword
-            for keyword in keywords:
-                matches = self.find_topic_matches(keyword)
-                
-                for match in matches:
-                    # Create unique combination key for deduplication
-                    combo_key = (url, match['product'], match['domain'], 
-                                match['segment'], match['topic'])
-                    
-                    # Only add if not seen before (deduplication)
-                    if combo_key not in seen_combinations:
-                        seen_combinations.add(combo_key)
-                        results.append({
-                            'URL': url,
-                            'Product': match['product'],
-                            'Domain': match['domain'],
-                            'Segment': match['segment'],
-                            'Topic': match['topic']
-                        })
-                        url_has_match = True
-                        
-                        # Track this segment combination for auto-addition
-                        if match['segment']:
-                            segment_key = (url, match['product'], match['domain'], match['segment'])
-                            matched_segments.add(segment_key)
-            
-            # AUTO-ADD: For each matched segment, add a row where Segment = Topic
-            for segment_combo in matched_segments:
-                url, product, domain, segment = segment_combo
-                combo_key = (url, product, domain, segment, segment)
-                
-                # Only add if this exact combination doesn't already exist
-                if combo_key not in seen_combinations:
-                    seen_combinations.add(combo_key)
-                    results.append({
-                        'URL': url,
-                        'Product': product,
-                        'Domain': domain,
-                        'Segment': segment,
-                        'Topic': segment  # Segment becomes the Topic
-                    })
-            
-            if url_has_match:
-                urls_with_matches += 1
-            else:
-                # Add unmapped URL to results with empty taxonomy fields
-                unmapped_urls.append(url)
-                results.append({
-                    'URL': url,
-                    'Product': '',
-                    'Domain': 'UNMAPPED',
-                    'Segment': '',
-                    'Topic': ''
-                })
-            
-            # Progress indicator
-            if (idx + 1) % 50 == 0:
-                print(f"  Processed {idx + 1}/{total_urls} URLs...")
+        unmapped_count = 0
+        dedup_rejections = 0
+        keyword_count = 0
+        reused_count = 0
+        self.row_hashes = {}
+        own_pool = pool is None and self.workers > 1
+        if own_pool:
+            pool = self.create_pool()
+        try:
+            for chunk in self.iter_semantic_chunks():
+                self.check_cancelled()
+                urls = self.column_values(chunk, 'URL')
+                url_keywords = self.extract_keyword_lists(chunk)
+                keyword_count += sum(len(keywords) for keywords in url_keywords)
+
+                reused = [None] * len(urls)
+                if self.incremental:
+                    for i, (url, keywords) in enumerate(zip(urls, url_keywords)):
+                        digest = row_hash(url, keywords)
+                        if url in self.row_hashes:
+                            digest = None  # Repeated URL: never reused
+                        elif previous is not None and previous.get(url, (None,))[0] == digest:
+                            reused[i] = previous[url][1]
+                        self.row_hashes[url] = digest
+
+                # Only rows that are not reused are matched
+                url_matches = iter(self.match_chunk(
+                    [keywords for keywords, rows in zip(url_keywords, reused) if rows is None],
+                    pool
+                ))
+
+                for url, reused_rows in zip(urls, reused):
+                    total_urls += 1
+                    progress.update(total_urls)
+
+                    if reused_rows is not None:
+                        results.extend(reused_rows)
+                        reused_count += 1
+                        if reused_rows[0][2] == 'UNMAPPED':
+                            unmapped_count += 1
+                        else:
+                            urls_with_matches += 1
+                        continue
+
+                    matches = next(url_matches)
+                    if url != current_url:
+                        current_url = url
+                        seen_combinations = set()
+                    url_has_match, rejected = self.emit_url_rows(
+                        url, matches, seen_combinations, results
+                    )
+                    dedup_rejections += rejected
+
+                    if url_has_match:
+                        urls_with_matches += 1
+                    else:
+                        unmapped_count += 1
+
+                if sink is not None:
+                    # Flush this chunk's rows so memory does not grow with the output
+                    with self.stats.stage('save'):
+                        sink.write_rows(results)
+                    output_rows += len(results)
+                    results = []
+        except MatchCancelled:
+            self.cancelled = True
+            print(f"\n  Cancelled: stopping after {total_urls} URLs")
+        finally:
+            if own_pool:
+                # A cancelled pool may still be running shards nobody will read
+                if self.cancelled:
+                    pool.terminate()
+                else:
+                    pool.close()
+                pool.join()
+        progress.update(total_urls, final=True)
+
+        if pool is not None:
+            print(f"  Matched in {self.workers} worker processes "
+                  f"({self.score_cache_loaded} variations from score cache)")
+        else:
+            print(f"  Scored {self.stats.counters.get('variations_scored', 0)} keyword variations "
+                  f"against {len(self.topic_choices)} topics "
+                  f"({self.score_cache_loaded} from score cache)")
         
         print(f"\nMatching complete!")
-        print(f"  URLs with matches: {urls_with_matches}/{total_urls} ({urls_with_matches/total_urls*100:.1f}%)")
-        print(f"  Unmapped URLs: {len(unmapped_urls)}/{total_urls} ({len(unmapped_urls)/total_urls*100:.1f}%)")
-        print(f"  Total output rows: {len(results)}")
-        print(f"  Average matches per URL: {len(results)/total_urls:.2f}")
+        percent = 100 / max(total_urls, 1)
+        print(f"  URLs with matches: {urls_with_matches}/{total_urls} ({urls_with_matches*percent:.1f}%)")
+        print(f"  Unmapped URLs: {unmapped_count}/{total_urls} ({unmapped_count*percent:.1f}%)")
+        output_rows += len(results)
+        print(f"  Total output rows: {output_rows}")
+        print(f"  Average matches per URL: {output_rows/max(total_urls, 1):.2f}")
+        if self.incremental:
+            print(f"  Incremental: reused {reused_count} URLs, "
+                  f"rematched {total_urls - reused_count}")
+        self.match_summary = {
+            'total_urls': total_urls,
+            'urls_with_matches': urls_with_matches,
+            'unmapped_urls': unmapped_count,
+            'output_rows': output_rows,
+            'cancelled': self.cancelled
+        }
+        self.stats.merge_counters({
+            'urls': total_urls,
+            'urls_reused': reused_count,
+            'keywords': keyword_count,
+            'keyword_cache_hits': self.cache_hits,
+            'keyword_cache_misses': self.cache_misses,
+            'rows_emitted': output_rows,
+            'dedup_rejections': dedup_rejections
+        })
+        lookups = self.cache_hits + self.cache_misses
+        if lookups:
+            print(f"  Keyword cache: {self.cache_hits} hits, {self.cache_misses} misses "
+                  f"({self.cache_hits/lookups*100:.1f}% hit rate)")
+        index = self.ngram_index
+        if index is not None and index.pairs_total:
+            print(f"  N-gram index: scored {index.pairs_scored}/{index.pairs_total} pairs "
+                  f"({index.pairs_scored/index.pairs_total*100:.1f}%), "
+                  f"{index.pairs_bounded} rejected by the character bound")
         
-        results_df = pd.DataFrame(results)
+        if sink is not None:
+            return None
+
+        results_df = pd.DataFrame(results, columns=OUTPUT_COLUMNS)
 
         # Apply consolidation if enabled
         if self.consolidate_topics:
@@ -294,6 +1228,7 @@ class TaxonomyMatcher:
 
         return results_df
 
+    @timed_stage('consolidation')
     def consolidate_results(self, results_df: pd.DataFrame) -> pd.DataFrame:
         """
         Consolidate multiple topic matches into single row per URL-Segment group.
@@ -305,86 +1240,77 @@ class TaxonomyMatcher:
             DataFrame with topics as columns (Topic_1, Topic_2, ...)
         """
         # Handle unmapped URLs separately
-        unmapped = results_df[results_df['Domain'] == 'UNMAPPED'].copy()
-        mapped = results_df[results_df['Domain'] != 'UNMAPPED'].copy()
-
-        if len(mapped) == 0:
-            return unmapped
+        if (results_df['Domain'] == 'UNMAPPED').all():
+            return results_df.copy()
 
-        # Group by (URL, Product, Domain, Segment)
-        grouped = mapped.groupby(['URL', 'Product', 'Domain', 'Segment'],
-                                dropna=False, sort=False)
-
-        consolidated_rows = []
-        max_topics = 0
-
-        for (url, product, domain, segment), group in grouped:
-            topics = group['Topic'].tolist()  # Preserves discovery order
-
-            # Filter out auto-added segment topics (segment name should not appear as topic)
-            topics = [t for t in topics if t != segment]
-
-            # Skip rows with no actual topics (only had segment-as-topic)
-            if not topics:
-                continue
-
-            max_topics = max(max_topics, len(topics))
-
-            row = {
-                'URL': url,
-                'Product': product,
-                'Domain': domain,
-                'Segment': segment
-            }
-
-            # Add topics as Topic_1, Topic_2, etc.
-            for i, topic in enumerate(topics, start=1):
-                row[f'Topic_{i}'] = topic
-
-            consolidated_rows.append(row)
-
-        consolidated_df = pd.DataFrame(consolidated_rows)
-
-        # Ensure all topic columns exist (fill missing with empty string)
-        for i in range(1, max_topics + 1):
-            col_name = f'Topic_{i}'
-            if col_name not in consolidated_df.columns:
-                consolidated_df[col_name] = ''
-
-        # Fill NaN with empty strings for cleaner Excel output
-        consolidated_df = consolidated_df.fillna('')
+        consolidated_df, unmapped = consolidate_topics(results_df)
+        max_topics = len(consolidated_df.columns) - len(unmapped.columns)
 
         # Re-add unmapped URLs with empty topic columns
         if len(unmapped) > 0:
-            for i in range(1, max_topics + 1):
-                unmapped[f'Topic_{i}'] = ''
-            unmapped = unmapped.drop('Topic', axis=1)
+            unmapped = unmapped.assign(**{column: '' for column in topic_columns(max_topics)})
             consolidated_df = pd.concat([consolidated_df, unmapped], ignore_index=True)
 
         print(f"  Consolidated to {len(consolidated_df)} rows with up to {max_topics} topics per row")
 
         return consolidated_df
 
-    def save_output(self, results_df: pd.DataFrame):
+    @timed_stage('save')
+    def save_output(self, results_df: pd.DataFrame, output_file: Optional[str] = None):
         """
         Save results to Excel file.
         
         Args:
             results_df: DataFrame with matched results
+            output_file: Destination path (defaults to self.output_file)
+        """
+        if output_file is None:
+            output_file = self.output_file
+        print(f"\nSaving results to {output_file}...")
+        results_df.to_excel(output_file, index=False)
+        self.print_saved(output_file, len(results_df[results_df['Domain'] == 'UNMAPPED']))
+
+    def match_to_file(self, output_file: Optional[str] = None, previous=None, pool=None):
+        """
+        Match all URLs, streaming the rows to the output file chunk by chunk.
+
+        Args:
+            output_file: Destination path (defaults to self.output_file)
+            previous: Previous results for incremental matching
+            pool: Optional shared process pool
+        """
+        if output_file is None:
+            output_file = self.output_file
+        print(f"\nStreaming results to {output_file}...")
+        if self.consolidate_topics:
+            width = self.taxonomy_lookup.max_group_topics()
+            with ConsolidatingSink(open_sink(output_file, consolidated_columns(width)), width) as sink:
+                self.process_matching(sink, previous, pool)
+            print(f"  Consolidated to {sink.sink.rows_written} rows with up to "
+                  f"{sink.max_topics} topics per row ({width} topic columns)")
+        else:
+            with open_sink(output_file) as sink:
+                self.process_matching(sink, previous, pool)
+        self.print_saved(output_file, self.match_summary['unmapped_urls'])
+
+    def print_saved(self, output_file: str, unmapped_count: int):
+        """
+        Report a written output file.
+
+        Args:
+            output_file: Path that was written
+            unmapped_count: Number of unmapped URL rows in the file
         """
-        print(f"\nSaving results to {self.output_file}...")
-        results_df.to_excel(self.output_file, index=False)
         print(f"Output saved successfully!")
-        print(f"  File: {os.path.abspath(self.output_file)}")
-        
+        print(f"  File: {os.path.abspath(output_file)}")
+
         # Show unmapped count in output
-        unmapped_count = len(results_df[results_df['Domain'] == 'UNMAPPED'])
         if unmapped_count > 0:
             print(f"\nâš ï¸  Note: {unmapped_count} unmapped URLs included in output")
             print(f"  Filter by Domain='UNMAPPED' to review these URLs")
     
-    def run(self):
-        """Execute the complete matching workflow."""
+    def print_header(self):
+        """Print the run banner with country and configuration details."""
         print("=" * 60)
         print(f"NL Taxonomy Mapper V3 - Country: {self.country_code}")
         print("=" * 60)
@@ -394,19 +1320,436 @@ class TaxonomyMatcher:
                            if c['code'] == self.country_code)
         print(f"Country: {country_info['name']} ({country_info['language']})")
         print(f"Threshold: {self.similarity_threshold}%")
+        if self.top_k_per_keyword or self.max_matches_per_url:
+            print(f"Match limits: {self.top_k_per_keyword or 'all'} topics per keyword, "
+                  f"{self.max_matches_per_url or 'all'} rows per URL")
         print(f"Synonyms loaded: {len(self.synonyms)} terms")
         print("=" * 60)
 
+    def compiled_taxonomy_status(self) -> str:
+        """Describe the compiled taxonomy: fresh, stale, missing or disabled."""
+        if not self.use_compiled_taxonomy:
+            return 'disabled'
+        compiled_file = artifact_file(self.taxonomy_file)
+        header = read_header(compiled_file)
+        if header is None:
+            return 'not compiled'
+        fresh = (header['taxonomy_digest'] == file_digest(self.taxonomy_file)
+                 and header['synonyms_digest'] == file_digest(self.synonyms_file))
+        return f"{'up to date' if fresh else 'out of date'} ({compiled_file})"
+
+    def dry_run(self) -> bool:
+        """
+        Print the resolved run configuration without loading or matching anything.
+
+        Returns:
+            True if all input files exist
+        """
+        self.print_header()
+        inputs_found = True
+        for label, path in (('Semantic carriers', self.semantic_file),
+                            ('Taxonomy', self.taxonomy_file)):
+            found = os.path.exists(path)
+            inputs_found = inputs_found and found
+            print(f"{label}: {path} ({'found' if found else 'MISSING'})")
+        if os.path.exists(self.taxonomy_file):
+            print(f"Compiled taxonomy: {self.compiled_taxonomy_status()}")
+        print(f"Input format: {self.semantic_format} (chunks of {self.chunk_size} URLs)")
+        print(f"Output: {self.output_file}"
+              f"{' (streamed)' if self.stream_output else ''}"
+              f"{' (consolidated)' if self.consolidate_topics else ''}")
+        print(f"Workers: {self.workers}, score cache: {'on' if self.use_score_cache else 'off'}, "
+              f"incremental: {'on' if self.incremental else 'off'}")
+        print("Dry run: nothing was loaded or matched")
+        return inputs_found
+
+    def stats_file(self) -> str:
+        """Path of the JSON statistics sidecar (next to the output file)."""
+        base, _ = os.path.splitext(self.output_file)
+        return f'{base}.stats.json'
+
+    def save_stats(self):
+        """Print the stage timing summary and write the stats sidecar if enabled."""
+        print(f"\nStage timings: {self.stats.summary()}")
+        if self.write_stats:
+            self.stats.write_json(
+                self.stats_file(),
+                country=self.country_code,
+                threshold=self.similarity_threshold,
+                workers=self.workers,
+                semantic_file=self.semantic_file,
+                taxonomy_file=self.taxonomy_file,
+                output_file=self.output_file,
+                summary=self.match_summary
+            )
+            print(f"Run statistics saved to: {self.stats_file()}")
+
+    def run(self):
+        """Execute the complete matching workflow."""
+        self.stats = RunStats()
+        self.print_header()
+
         self.load_data()
         self.build_taxonomy_lookup()
-        results_df = self.process_matching()
-        self.save_output(results_df)
+        self.match_and_save()
 
         print("\n" + "=" * 60)
-        print("Process completed successfully!")
+        if self.cancelled:
+            print("Process cancelled - partial results were saved")
+        else:
+            print("Process completed successfully!")
         print(f"Output saved to: {self.output_file}")
         print("=" * 60)
 
+    def match_and_save(self, pool=None):
+        """
+        Match the loaded data, write the output, manifest and statistics.
+
+        Args:
+            pool: Optional shared process pool (see run_countries)
+        """
+        previous = self.load_previous_results() if self.incremental else None
+        if self.stream_output:
+            self.match_to_file(previous=previous, pool=pool)
+        else:
+            results_df = self.process_matching(previous=previous, pool=pool)
+            self.save_output(results_df)
+        if self.incremental:
+            self.save_manifest()
+        self.close_score_cache()
+        self.save_stats()
+
+    def run_in_memory(self) -> pd.DataFrame:
+        """
+        Match and return the results without writing any file.
+
+        Data set with set_taxonomy_data()/set_semantic_data() is used as is;
+        anything not provided is loaded from the configured files.
+
+        Returns:
+            Results DataFrame (consolidated if consolidate_topics is enabled)
+        """
+        self.stats = RunStats()
+        if (self.taxonomy_df is None and self.taxonomy_artifact is None) or self.semantic_df is None:
+            self.load_data()
+        if self.ngram_index is None:
+            self.build_taxonomy_lookup()
+        results_df = self.process_matching()
+        self.close_score_cache()
+        return results_df
+
+    def sweep_output_file(self, threshold: int) -> str:
+        """
+        Output path for one threshold of a sweep (e.g. taxonomy_match_NL_80per.xlsx).
+
+        Args:
+            threshold: Similarity threshold
+
+        Returns:
+            Output file path
+        """
+        base, ext = os.path.splitext(self.output_file)
+        return f'{base}_{threshold}per{ext}'
+
+    def run_sweep(self, thresholds: List[int]) -> pd.DataFrame:
+        """
+        Match at several thresholds, loading and scoring the data only once.
+
+        Scores are computed at the lowest threshold; each higher threshold only
+        filters the same score matrix. Writes one output per threshold plus a
+        summary workbook comparing them.
+
+        Args:
+            thresholds: Similarity thresholds to compare
+
+        Returns:
+            DataFrame with one summary row per threshold
+        """
+        thresholds = sorted(set(thresholds))
+        self.similarity_threshold = thresholds[0]
+        self.stats = RunStats()
+        self.print_header()
+        print(f"Threshold sweep: {', '.join(f'{t}%' for t in thresholds)}")
+        if self.incremental:
+            print("Note: incremental mode is ignored for threshold sweeps")
+            self.incremental = False
+
+        self.load_data()
+        self.build_taxonomy_lookup()
+
+        summary_rows = []
+        for threshold in thresholds:
+            print("\n" + "-" * 60)
+            print(f"Threshold {threshold}%")
+            print("-" * 60)
+            self.similarity_threshold = threshold
+            output_file = self.sweep_output_file(threshold)
+            if self.stream_output:
+                self.match_to_file(output_file)
+            else:
+                results_df = self.process_matching()
+                self.save_output(results_df, output_file)
+
+            summary = self.match_summary
+            total_urls = summary['total_urls']
+            summary_rows.append({
+                'Threshold': threshold,
+                'URLs': total_urls,
+                'URLs with matches': summary['urls_with_matches'],
+                'Match rate (%)': round(summary['urls_with_matches'] / total_urls * 100, 1)
+                                  if total_urls else 0.0,
+                'Unmapped URLs': summary['unmapped_urls'],
+                'Output rows': summary['output_rows'],
+                'Rows per URL': round(summary['output_rows'] / total_urls, 2) if total_urls else 0.0,
+                'Output file': output_file
+            })
+            if self.cancelled:
+                print("Sweep cancelled: remaining thresholds skipped")
+                break
+
+        self.close_score_cache()
+
+        summary_df = pd.DataFrame(summary_rows)
+        base, ext = os.path.splitext(self.output_file)
+        summary_file = f'{base}_sweep_summary{ext if ext in (".xlsx", ".xls") else ".xlsx"}'
+        summary_df.to_excel(summary_file, sheet_name='Summary', index=False)
+        self.save_stats()
+
+        print("\n" + "=" * 60)
+        print("Threshold sweep cancelled - partial results were saved" if self.cancelled
+              else "Threshold sweep completed successfully!")
+        print(summary_df[['Threshold', 'Match rate (%)', 'Unmapped URLs', 'Rows per URL']]
+              .to_string(index=False))
+        print(f"Summary saved to: {summary_file}")
+        print("=" * 60)
+
+        return summary_df
+
+
+def resolve_countries(value: str, config_file: str = 'config.yaml') -> List[str]:
+    """
+    Parse a --countries value.
+
+    Args:
+        value: 'all' or comma-separated country codes
+
+    Returns:
+        Country codes ('all' = every enabled country in config.yaml)
+
+    Raises:
+        ValueError: If a code is not in config.yaml
+    """
+    country_config = CountryConfig(config_file)
+    if value.strip().lower() == 'all':
+        return [c['code'] for c in country_config.get_available_countries()]
+
+    codes = [code.strip().upper() for code in value.split(',') if code.strip()]
+    unknown = [code for code in codes if code not in country_config.config['countries']]
+    if unknown:
+        raise ValueError(f"Unknown countries: {', '.join(unknown)}")
+    return list(dict.fromkeys(codes))
+
+
+def validate_config(config_file: str = 'config.yaml') -> List[str]:
+    """
+    Check config.yaml and every enabled country's files and settings.
+
+    Args:
+        config_file: Path to config.yaml
+
+    Returns:
+        List of problems (empty if the configuration is valid)
+    """
+    country_config = CountryConfig(config_file)
+    problems = []
+    for country in country_config.get_available_countries():
+        code = country['code']
+        country_problems = []
+        settings = country_config.get_country_settings(code)
+
+        threshold = settings.get('similarity_threshold', 80)
+        if not isinstance(threshold, int) or not 50 <= threshold <= 100:
+            country_problems.append(f"similarity_threshold must be 50-100, got {threshold!r}")
+        for key in ('workers', 'chunk_size'):
+            value = settings.get(key, 1)
+            if not isinstance(value, int) or value < 1:
+                country_problems.append(f"{key} must be a positive integer, got {value!r}")
+        for key in ('top_k_per_keyword', 'max_matches_per_url'):
+            value = settings.get(key, 0)
+            if not isinstance(value, int) or value < 0:
+                country_problems.append(f"{key} must be 0 (no limit) or a positive integer, "
+                                        f"got {value!r}")
+
+        files = country_config.get_country_files(code)
+        try:
+            detect_format(files['semantic_carriers'], country_config.get_semantic_format(code))
+        except ValueError as e:
+            country_problems.append(str(e))
+        _, missing = country_config.validate_country_files(code)
+        country_problems.extend(f"missing {entry}" for entry in missing)
+        if os.path.exists(files['synonyms']):
+            try:
+                with open(files['synonyms'], 'r', encoding='utf-8') as f:
+                    json.load(f)
+            except json.JSONDecodeError as e:
+                country_problems.append(f"invalid synonyms JSON: {e}")
+
+        print(f"  {code}: {'OK' if not country_problems else 'problems found'}")
+        for problem in country_problems:
+            print(f"    - {problem}")
+        problems.extend(f"{code}: {problem}" for problem in country_problems)
+    return problems
+
+
+def run_countries(country_codes: List[str], output_file: Optional[str] = None,
+                  workers: Optional[int] = None, config_file: str = 'config.yaml',
+                  cancel_token: Optional[CancellationToken] = None,
+                  **options) -> pd.DataFrame:
+    """
+    Match several countries in one process, sharing one worker pool.
+
+    Every country is loaded and its lookup built first; the pool is then
+    started once with all matchers, so workers stay warm across countries.
+    Countries whose input files are missing are skipped.
+
+    Args:
+        country_codes: Countries to run
+        output_file: Output base name (country code is appended per country)
+        workers: Worker processes shared by all countries (default: one per CPU)
+        config_file: Path to config.yaml
+        cancel_token: Token that stops the run; countries not started are skipped
+        **options: Further TaxonomyMatcher arguments (threshold, consolidate_topics, ...)
+
+    Returns:
+        DataFrame with one summary row per country
+    """
+    country_config = CountryConfig(config_file)
+    matchers = {}
+    for code in country_codes:
+        valid, missing = country_config.validate_country_files(code)
+        if not valid:
+            print(f"Skipping {code}: missing {', '.join(missing)}")
+            continue
+        matchers[code] = TaxonomyMatcher(country_code=code, output_file=output_file,
+                                         workers=workers, config_file=config_file, **options)
+        if cancel_token is not None:
+            matchers[code].cancel_token = cancel_token
+    if not matchers:
+        raise ValueError("None of the requested countries has its input files")
+
+    # One pool for every country, so each country's scoring is split across all CPUs
+    pool_size = workers or os.cpu_count() or 1
+    timings = {}
+    for code, matcher in matchers.items():
+        start = time.perf_counter()
+        matcher.stats = RunStats()
+        matcher.print_header()
+        matcher.load_data()
+        matcher.build_taxonomy_lookup()
+        matcher.workers = pool_size
+        timings[code] = time.perf_counter() - start
+
+    pool = None
+    if pool_size > 1:
+        pool = multiprocessing.Pool(pool_size, initializer=init_worker, initargs=(matchers,))
+
+    summary_rows = []
+    try:
+        for code, matcher in matchers.items():
+            print("\n" + "-" * 60)
+            print(f"Matching {code}")
+            print("-" * 60)
+            start = time.perf_counter()
+            matcher.match_and_save(pool)
+            timings[code] += time.perf_counter() - start
+
+            summary = matcher.match_summary
+            total_urls = summary['total_urls']
+            summary_rows.append({
+                'Country': code,
+                'Threshold': matcher.similarity_threshold,
+                'URLs': total_urls,
+                'URLs with matches': summary['urls_with_matches'],
+                'Match rate (%)': round(summary['urls_with_matches'] / total_urls * 100, 1)
+                                  if total_urls else 0.0,
+                'Unmapped URLs': summary['unmapped_urls'],
+                'Output rows': summary['output_rows'],
+                'Seconds': round(timings[code], 2),
+                'Output file': matcher.output_file
+            })
+            if matcher.cancelled:
+                print("Run cancelled: remaining countries skipped")
+                break
+    finally:
+        if pool is not None:
+            if cancel_token is not None and cancel_token.cancelled:
+                pool.terminate()
+            else:
+                pool.close()
+            pool.join()
+
+    summary_df = pd.DataFrame(summary_rows)
+    base, ext = os.path.splitext(output_file or 'taxonomy_match.xlsx')
+    summary_file = f'{base}_countries_summary{ext if ext in (".xlsx", ".xls") else ".xlsx"}'
+    summary_df.to_excel(summary_file, sheet_name='Summary', index=False)
+
+    print("\n" + "=" * 60)
+    print(f"Multi-country run {'cancelled' if cancel_token and cancel_token.cancelled else 'completed'}: "
+          f"{', '.join(summary_df['Country']) if len(summary_df) else 'no countries matched'}")
+    print(summary_df[['Country', 'URLs', 'Match rate (%)', 'Unmapped URLs', 'Seconds']]
+          .to_string(index=False))
+    print(f"Summary saved to: {summary_file}")
+    print("=" * 60)
+
+    return summary_df
+
+
+def cancel_on_interrupt(token: CancellationToken):
+    """
+    Make Ctrl-C cancel matching cleanly instead of killing the run.
+
+    The first Ctrl-C cancels the token, so the run stops after the current
+    URL batch and writes its partial output; a second one aborts at once.
+
+    Args:
+        token: Token shared with the running matcher(s)
+    """
+    def handler(signum, frame):
+        if token.cancelled:
+            raise KeyboardInterrupt
+        token.cancel()
+        print("\nCancelling after the current batch, partial output will be saved "
+              "(press Ctrl-C again to abort)...")
+
+    signal.signal(signal.SIGINT, handler)
+
+
+def parse_thresholds(value: str) -> List[int]:
+    """
+    Parse a comma-separated threshold list such as "75,80,85".
+
+    Args:
+        value: Comma-separated integers
+
+    Returns:
+        List of thresholds
+
+    Raises:
+        ValueError: If a value is not an integer between 50 and 100
+    """
+    thresholds = []
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        threshold = int(part)
+        if not 50 <= threshold <= 100:
+            raise ValueError(f"Threshold {threshold} outside range 50-100")
+        thresholds.append(threshold)
+    if not thresholds:
+        raise ValueError("No thresholds given")
+    return thresholds
+
 
 def get_threshold_from_user() -> int:
     """
@@ -464,16 +1807,40 @@ def main():
         help='Country code (NL, SE, BE, etc.)',
         default=None
     )
+    parser.add_argument(
+        '--countries',
+        type=str,
+        help="Run several countries in one process: 'all' or a list like NL,SE",
+        default=None
+    )
     parser.add_argument(
         '-t', '--threshold',
         type=int,
         help='Similarity threshold (50-100)',
         default=None
     )
+    parser.add_argument(
+        '--thresholds',
+        type=str,
+        help='Comma-separated thresholds to sweep in one scoring pass (e.g. 75,80,85,90,95)',
+        default=None
+    )
     parser.add_argument(
         '--semantic-file',
         type=str,
-        help='Path to semantic carriers file (overrides config)',
+        help='Path to semantic carriers file: .xlsx, .csv, .parquet or .jsonl (overrides config)',
+        default=None
+    )
+    parser.add_argument(
+        '--input-format',
+        choices=SUPPORTED_FORMATS,
+        help='Semantic carriers file format (default: detect from extension)',
+        default=None
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        help='URLs matched per chunk when streaming input (default: 10000)',
         default=None
     )
     parser.add_argument(
@@ -494,6 +1861,72 @@ def main():
         help='Consolidate multiple topics into columns (Topic_1, Topic_2, ...)',
         default=None
     )
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        help='Number of worker processes for matching (default: 1, or one per CPU with --countries)',
+        default=None
+    )
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='Write run statistics to a .stats.json file next to the output',
+        default=None
+    )
+    parser.add_argument(
+        '--stream-output',
+        action='store_true',
+        help='Write output rows chunk by chunk (.xlsx, .csv or .parquet) to bound memory',
+        default=None
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Rematch only URLs changed since the previous run (uses <output>.manifest.json)',
+        default=None
+    )
+    parser.add_argument(
+        '--previous-output',
+        type=str,
+        help='Previous output to reuse in --incremental mode (default: the output file)',
+        default=None
+    )
+    parser.add_argument(
+        '--top-k',
+        type=int,
+        dest='top_k_per_keyword',
+        help='Keep only the K best-scoring topics per keyword (0 = all, default: from config)',
+        default=None
+    )
+    parser.add_argument(
+        '--max-matches-per-url',
+        type=int,
+        help='Keep the best matches within N output rows per URL, auto-added segment rows '
+             'included; the best match is always kept (0 = all, default: from config)',
+        default=None
+    )
+    parser.add_argument(
+        '--no-score-cache',
+        action='store_false',
+        dest='score_cache',
+        help='Do not read or write the persistent score cache',
+        default=None
+    )
+    parser.add_argument(
+        '--compile-taxonomy',
+        action='store_true',
+        help='Compile the taxonomy and synonyms of -c/--countries into a binary artifact and exit'
+    )
+    parser.add_argument(
+        '--validate-config',
+        action='store_true',
+        help='Check config.yaml and every enabled country\'s files, then exit'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Print the resolved files and settings without loading or matching anything'
+    )
 
     args = parser.parse_args()
 
@@ -501,8 +1934,102 @@ def main():
     print("           NL TAXONOMY MAPPER V3 - SETUP")
     print("=" * 60)
 
+    # Parse sweep thresholds if requested
+    thresholds = None
+    if args.thresholds:
+        try:
+            thresholds = parse_thresholds(args.thresholds)
+        except ValueError as e:
+            parser.error(f"--thresholds: {e}")
+
+    if args.validate_config:
+        print("\nValidating configuration...")
+        try:
+            problems = validate_config()
+        except Exception as e:
+            print(f"\nâŒ Error: {e}")
+            exit(1)
+        if problems:
+            print(f"\n{len(problems)} problem(s) found")
+            exit(1)
+        print("\nConfiguration is valid")
+        return
+
+    if args.compile_taxonomy or args.dry_run:
+        try:
+            codes = resolve_countries(args.countries) if args.countries else [args.country]
+            all_found = True
+            for code in codes:
+                matcher = TaxonomyMatcher(
+                    country_code=code,
+                    semantic_file=args.semantic_file,
+                    taxonomy_file=args.taxonomy_file,
+                    output_file=args.output,
+                    similarity_threshold=args.threshold or (min(thresholds) if thresholds else None),
+                    consolidate_topics=args.consolidate_topics,
+                    use_score_cache=args.score_cache,
+                    workers=args.workers,
+                    chunk_size=args.chunk_size,
+                    semantic_format=args.input_format,
+                    stream_output=args.stream_output,
+                    incremental=args.incremental,
+                    top_k_per_keyword=args.top_k_per_keyword,
+                    max_matches_per_url=args.max_matches_per_url
+                )
+                if args.dry_run:
+                    all_found = matcher.dry_run() and all_found
+                elif os.path.exists(matcher.taxonomy_file):
+                    matcher.compile_taxonomy()
+                else:
+                    print(f"Warning: Skipping {matcher.country_code}, "
+                          f"taxonomy not found: {matcher.taxonomy_file}")
+                    all_found = False
+        except Exception as e:
+            print(f"\nâŒ Error: {e}")
+            print("\nFor help, run: python taxonomy_matcher.py --help")
+            exit(1)
+        if not all_found:
+            exit(1)
+        return
+
+    # Multi-country run: thresholds come from -t or each country's config
+    cancel_token = CancellationToken()
+    if args.countries:
+        if thresholds or args.country or args.semantic_file or args.taxonomy_file:
+            parser.error("--countries cannot be combined with -c, --thresholds, "
+                         "--semantic-file or --taxonomy-file")
+        cancel_on_interrupt(cancel_token)
+        try:
+            run_countries(
+                resolve_countries(args.countries),
+                cancel_token=cancel_token,
+                output_file=args.output,
+                workers=args.workers,
+                similarity_threshold=args.threshold,
+                consolidate_topics=args.consolidate_topics,
+                use_score_cache=args.score_cache,
+                write_stats=args.stats,
+                chunk_size=args.chunk_size,
+                stream_output=args.stream_output,
+                incremental=args.incremental,
+                top_k_per_keyword=args.top_k_per_keyword,
+                max_matches_per_url=args.max_matches_per_url
+            )
+        except KeyboardInterrupt:
+            print("\nAborted")
+            exit(130)
+        except Exception as e:
+            print(f"\nâŒ Error: {e}")
+            print("\nFor help, run: python taxonomy_matcher.py --help")
+            exit(1)
+        if cancel_token.cancelled:
+            exit(130)
+        return
+
     # Get threshold (CLI arg takes precedence, otherwise prompt)
     threshold = args.threshold
+    if threshold is None and thresholds:
+        threshold = min(thresholds)
     if threshold is None:
         threshold = get_threshold_from_user()
 
@@ -514,16 +2041,38 @@ def main():
             taxonomy_file=args.taxonomy_file,
             output_file=args.output,
             similarity_threshold=threshold,
-            consolidate_topics=args.consolidate_topics
+            consolidate_topics=args.consolidate_topics,
+            use_score_cache=args.score_cache,
+            workers=args.workers,
+            write_stats=args.stats,
+            chunk_size=args.chunk_size,
+            semantic_format=args.input_format,
+            stream_output=args.stream_output,
+            incremental=args.incremental,
+            previous_output=args.previous_output,
+            top_k_per_keyword=args.top_k_per_keyword,
+            max_matches_per_url=args.max_matches_per_url
         )
+        matcher.cancel_token = cancel_token
+        cancel_on_interrupt(cancel_token)
 
-        matcher.run()
+        if thresholds:
+            matcher.run_sweep(thresholds)
+        else:
+            matcher.run()
 
+    except KeyboardInterrupt:
+        print("\nAborted")
+        exit(130)
     except Exception as e:
         print(f"\nâŒ Error: {e}")
         print("\nFor help, run: python taxonomy_matcher.py --help")
         exit(1)
 
+    if cancel_token.cancelled:
+        exit(130)
+
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -6,13 +6,23 @@ Modern interface with multi-country support
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import threading
+import multiprocessing
 import os
 from datetime import datetime
-from taxonomy_matcher import TaxonomyMatcher
+from taxonomy_matcher import TaxonomyMatcher, parse_thresholds
 from country_config import CountryConfig
+from log_channel import ChannelWriter, LogChannel
+from progress import CancellationToken, format_progress
 import sys
 
 
+# Log pump: queued events are moved into the log widget in batches
+LOG_PUMP_INTERVAL_MS = 100
+LOG_PUMP_BATCH = 500
+# Older lines are trimmed so long runs do not slow the log widget down
+MAX_LOG_LINES = 5000
+
+
 class TaxonomyMapperGUI:
     """Modern GUI application for NL Taxonomy Mapper."""
     
@@ -44,8 +54,15 @@ class TaxonomyMapperGUI:
         self.output_file = tk.StringVar(value='taxonomy_match.xlsx')
         self.threshold = tk.IntVar(value=80)
         self.consolidate_topics = tk.BooleanVar(value=False)
+        self.sweep_thresholds = tk.StringVar(value='')
+        self.top_k_per_keyword = tk.IntVar(value=0)
+        self.max_matches_per_url = tk.IntVar(value=0)
         self.is_processing = False
 
+        # Worker threads never touch Tk; they queue events that pump_log() drains
+        self.log_channel = LogChannel()
+        self.cancel_token = CancellationToken()
+
         # Country configuration
         try:
             self.country_config = CountryConfig()
@@ -61,6 +78,7 @@ class TaxonomyMapperGUI:
             return
 
         self.selected_country = tk.StringVar(value=default_country)
+        self.load_match_limits(default_country)
 
         # Create UI
         self.create_header()
@@ -71,6 +89,7 @@ class TaxonomyMapperGUI:
         self.on_consolidate_toggle()  # Set initial status
 
         self.center_window()
+        self.root.after(LOG_PUMP_INTERVAL_MS, self.pump_log)
         
     def center_window(self):
         """Center window on screen."""
@@ -209,6 +228,68 @@ class TaxonomyMapperGUI:
             fg=self.colors['text_light']
         ).pack(padx=20, pady=(0, 8))
 
+        # Threshold Sweep Option
+        sweep_frame = tk.Frame(settings_card, bg=self.colors['card'])
+        sweep_frame.pack(fill='x', padx=20, pady=(0, 8))
+
+        tk.Label(
+            sweep_frame,
+            text="Threshold Sweep:",
+            font=('Segoe UI', 10),
+            bg=self.colors['card'],
+            fg=self.colors['text']
+        ).pack(side='left')
+
+        tk.Entry(
+            sweep_frame,
+            textvariable=self.sweep_thresholds,
+            font=('Segoe UI', 9),
+            relief='solid',
+            bd=1,
+            width=25
+        ).pack(side='left', padx=10)
+
+        tk.Label(
+            sweep_frame,
+            text="Optional, e.g. 75,80,85,90,95 (one output per threshold)",
+            font=('Segoe UI', 9),
+            bg=self.colors['card'],
+            fg=self.colors['text_light']
+        ).pack(side='left')
+
+        # Match Limits
+        limits_frame = tk.Frame(settings_card, bg=self.colors['card'])
+        limits_frame.pack(fill='x', padx=20, pady=(0, 8))
+
+        for label, variable in (("Top topics per keyword:", self.top_k_per_keyword),
+                                ("Max rows per URL:", self.max_matches_per_url)):
+            tk.Label(
+                limits_frame,
+                text=label,
+                font=('Segoe UI', 10),
+                bg=self.colors['card'],
+                fg=self.colors['text']
+            ).pack(side='left')
+
+            tk.Spinbox(
+                limits_frame,
+                from_=0,
+                to=1000,
+                textvariable=variable,
+                font=('Segoe UI', 9),
+                relief='solid',
+                bd=1,
+                width=6
+            ).pack(side='left', padx=(10, 20))
+
+        tk.Label(
+            limits_frame,
+            text="0 = no limit; keeps the best-scoring matches (segment rows count as rows)",
+            font=('Segoe UI', 9),
+            bg=self.colors['card'],
+            fg=self.colors['text_light']
+        ).pack(side='left')
+
         # Topic Consolidation Option
         consolidate_frame = tk.Frame(settings_card, bg=self.colors['card'])
         consolidate_frame.pack(fill='x', padx=20, pady=10)
@@ -263,6 +344,21 @@ class TaxonomyMapperGUI:
             cursor='hand2'
         )
         self.run_btn.pack(side='left', padx=5)
+
+        self.cancel_btn = tk.Button(
+            btn_frame,
+            text=" Cancel",
+            command=self.cancel_matching,
+            font=('Segoe UI', 10),
+            bg=self.colors['error'],
+            fg='white',
+            relief='flat',
+            padx=20,
+            pady=12,
+            cursor='hand2',
+            state='disabled'
+        )
+        self.cancel_btn.pack(side='left', padx=5)
         
         reset_btn = tk.Button(
             btn_frame,
@@ -460,7 +556,9 @@ class TaxonomyMapperGUI:
         else:
             file = filedialog.askopenfilename(
                 title=title,
-                filetypes=[("Excel files", "*.xlsx *.xls"), ("All files", "*.*")]
+                filetypes=[("Excel files", "*.xlsx *.xls"),
+                           ("CSV, Parquet or JSONL files", "*.csv *.parquet *.pq *.jsonl *.ndjson"),
+                           ("All files", "*.*")]
             )
         
         if file:
@@ -538,11 +636,19 @@ class TaxonomyMapperGUI:
             else:
                 self.output_file.set(f'taxonomy_match_{country_code}.xlsx')
 
+            self.load_match_limits(country_code)
+
             self.log(f"Switched to {self._get_country_display_name(country_code)}")
 
         except Exception as e:
             self.log(f"Warning: Could not load files for {country_code}: {e}")
 
+    def load_match_limits(self, country_code):
+        """Set the match limit fields to the country's configured limits."""
+        settings = self.country_config.get_country_settings(country_code)
+        self.top_k_per_keyword.set(settings.get('top_k_per_keyword', 0))
+        self.max_matches_per_url.set(settings.get('max_matches_per_url', 0))
+
     def on_consolidate_toggle(self):
         """Handle consolidation checkbox toggle - update status indicator."""
         if self.consolidate_topics.get():
@@ -555,15 +661,51 @@ class TaxonomyMapperGUI:
         self.threshold_label.config(text=f"{int(float(value))}%")
         
     def log(self, message):
-        """Add message to log."""
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        self.log_text.insert('end', f'[{timestamp}] {message}\n')
-        self.log_text.see('end')
-        self.root.update()
+        """Add message to log (safe from any thread; shown by pump_log)."""
+        self.log_channel.log(message)
+
+    def pump_log(self):
+        """Move queued log events into the log widget, one batch per call."""
+        events = self.log_channel.drain(LOG_PUMP_BATCH)
+        lines = [f"[{datetime.fromtimestamp(event.created).strftime('%H:%M:%S')}] "
+                 f"{event.payload}\n"
+                 for event in events if event.kind == 'log']
+        progress = [event.payload for event in events if event.kind == 'progress']
+        if progress:
+            self.show_progress(progress[-1])  # Only the latest report matters
+        if lines:
+            self.log_text.insert('end', ''.join(lines))
+            line_count = int(self.log_text.index('end-1c').split('.')[0])
+            if line_count > MAX_LOG_LINES:
+                self.log_text.delete('1.0', f'{line_count - MAX_LOG_LINES}.0')
+            self.log_text.see('end')
+
+        for event in events:
+            if event.kind == 'done':
+                self.finish(**event.payload)
+
+        # Drain again right away while a backlog remains
+        delay = 1 if len(events) >= LOG_PUMP_BATCH else LOG_PUMP_INTERVAL_MS
+        self.root.after(delay, self.pump_log)
+
+    def show_progress(self, report):
+        """Show a ProgressReport on the progress bar and status line."""
+        if report.total:
+            if str(self.progress['mode']) != 'determinate':
+                self.progress.stop()
+                self.progress.config(mode='determinate')
+            self.progress.config(maximum=report.total, value=min(report.done, report.total))
+        self.status_label.config(text=format_progress(report))
         
     def clear_log(self):
-        """Clear log."""
+        """Clear log, including lines not shown yet (other events are still handled)."""
+        events = self.log_channel.drain(self.log_channel.queue.maxsize)
         self.log_text.delete('1.0', 'end')
+        for event in events:
+            if event.kind == 'progress':
+                self.show_progress(event.payload)
+            elif event.kind == 'done':
+                self.finish(**event.payload)
         
     def copy_log(self):
         """Copy log to clipboard."""
@@ -579,6 +721,8 @@ class TaxonomyMapperGUI:
         self.output_file.set('taxonomy_match.xlsx')
         self.threshold.set(80)
         self.consolidate_topics.set(False)
+        self.sweep_thresholds.set('')
+        self.load_match_limits(self.selected_country.get())
         self.on_consolidate_toggle()  # Update status indicator
         self.clear_log()
         self.log("Form reset")
@@ -600,6 +744,21 @@ class TaxonomyMapperGUI:
         if not os.path.exists(self.taxonomy_file.get()):
             messagebox.showerror("Error", "Taxonomy file not found")
             return False
+        if self.sweep_thresholds.get().strip():
+            try:
+                parse_thresholds(self.sweep_thresholds.get())
+            except ValueError as e:
+                messagebox.showerror("Error", f"Invalid threshold sweep: {e}")
+                return False
+        for label, variable in (("Top topics per keyword", self.top_k_per_keyword),
+                                ("Max rows per URL", self.max_matches_per_url)):
+            try:
+                value = variable.get()
+            except tk.TclError:
+                value = -1
+            if value < 0:
+                messagebox.showerror("Error", f"{label} must be 0 (no limit) or a positive number")
+                return False
         return True
         
     def run_matching(self):
@@ -610,70 +769,101 @@ class TaxonomyMapperGUI:
             
         if not self.validate_inputs():
             return
+
+        # Tk variables may only be read on the main thread; the worker gets plain values
+        settings = {
+            'country_code': self.selected_country.get(),
+            'semantic_file': self.semantic_file.get(),
+            'taxonomy_file': self.taxonomy_file.get(),
+            'output_file': self.output_file.get(),
+            'similarity_threshold': self.threshold.get(),
+            'consolidate_topics': self.consolidate_topics.get(),
+            'top_k_per_keyword': self.top_k_per_keyword.get(),
+            'max_matches_per_url': self.max_matches_per_url.get()
+        }
+        sweep = self.sweep_thresholds.get().strip()
             
         self.run_btn.config(state='disabled')
+        self.cancel_btn.config(state='normal')
         self.is_processing = True
+        self.cancel_token = CancellationToken()
+        # Indeterminate until the first progress report gives the URL count
+        self.progress.config(mode='indeterminate', value=0)
         self.progress.start()
         self.status_label.config(text="Processing...")
         self.clear_log()
         
-        thread = threading.Thread(target=self.process, daemon=True)
+        thread = threading.Thread(target=self.process, args=(settings, sweep), daemon=True)
         thread.start()
-        
-    def process(self):
-        """Process matching."""
+
+    def cancel_matching(self):
+        """Stop the running match after its current batch; partial output is saved."""
+        if not self.is_processing:
+            return
+        self.cancel_token.cancel()
+        self.cancel_btn.config(state='disabled')
+        self.status_label.config(text="Cancelling...")
+        self.log("Cancelling after the current batch, partial output will be saved...")
+        
+    def process(self, settings: dict, sweep: str):
+        """Process matching with the form values read by run_matching (worker thread; reports through log_channel)."""
+        result = {'title': "Error", 'message': '', 'error': True}
         try:
             self.log("=" * 50)
             self.log("Starting NL Taxonomy Mapper V3")
             self.log("=" * 50)
 
-            matcher = TaxonomyMatcher(
-                country_code=self.selected_country.get(),
-                semantic_file=self.semantic_file.get(),
-                taxonomy_file=self.taxonomy_file.get(),
-                output_file=self.output_file.get(),
-                similarity_threshold=self.threshold.get(),
-                consolidate_topics=self.consolidate_topics.get()
-            )
-            
-            # Redirect print to log
+            matcher = TaxonomyMatcher(**settings)
+            matcher.cancel_token = self.cancel_token
+            matcher.progress_callback = lambda report: self.log_channel.put('progress', report)
+
+            # Redirect print to the log channel
             original_stdout = sys.stdout
+            writer = ChannelWriter(self.log_channel)
+            sys.stdout = writer
+            try:
+                if sweep:
+                    matcher.run_sweep(parse_thresholds(sweep))
+                else:
+                    matcher.run()
+            finally:
+                writer.flush()
+                sys.stdout = original_stdout
             
-            class LogWriter:
-                def __init__(self, log_func):
-                    self.log_func = log_func
-                def write(self, text):
-                    if text.strip():
-                        self.log_func(text.strip())
-                def flush(self):
-                    pass
-            
-            sys.stdout = LogWriter(self.log)
-            matcher.run()
-            sys.stdout = original_stdout
-            
+            outcome = "Cancelled" if matcher.cancelled else "Completed"
             self.log("=" * 50)
-            self.log(" Completed successfully!")
+            self.log(f" {outcome}{' - partial results saved' if matcher.cancelled else ' successfully!'}")
             self.log("=" * 50)
-            
-            self.root.after(0, lambda: messagebox.showinfo(
-                "Success",
-                f"Matching completed!\n\nOutput: {self.output_file.get()}"
-            ))
+
+            if sweep:
+                message = f"Threshold sweep {outcome.lower()}!\n\nOutputs: {matcher.sweep_output_file('*')}"
+            else:
+                message = f"Matching {outcome.lower()}!\n\nOutput: {settings['output_file']}"
+            if matcher.cancelled:
+                message += "\n\nOnly the URLs matched before cancelling are included."
+            result = {'title': outcome if matcher.cancelled else "Success",
+                      'message': message, 'error': False}
             
         except Exception as e:
             self.log(f" Error: {str(e)}")
-            self.root.after(0, lambda: messagebox.showerror("Error", str(e)))
+            result['message'] = str(e)
             
         finally:
-            self.root.after(0, self.finish)
+            # Must not be dropped: wait for room in the queue if it is full
+            self.log_channel.put('done', result, block=True)
             
-    def finish(self):
-        """Finish processing."""
+    def finish(self, title: str, message: str, error: bool):
+        """Finish processing (main thread) and show the outcome."""
         self.progress.stop()
+        self.progress.config(mode='indeterminate', value=0)
         self.run_btn.config(state='normal')
+        self.cancel_btn.config(state='disabled')
         self.is_processing = False
-        self.status_label.config(text="Ready")
+        self.status_label.config(text="Cancelled" if title == "Cancelled" else "Ready")
+        if error:
+            messagebox.showerror(title, message)
+        else:
+            messagebox.showinfo(title, message)
 
 
 def main():
@@ -684,4 +874,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file